@@ -0,0 +1,61 @@
+"""
+Logging handlers for the agbado project.
+
+This module contains a file handler that hands records to a background
+thread, so writing the log file never blocks the thread handling a request.
+"""
+
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+
+class BackgroundFileHandler(QueueHandler):
+    """
+    Writes log records to a file from a background thread.
+
+    Records are formatted on the calling thread and put on an in-memory queue;
+    a QueueListener thread drains the queue into a FileHandler. The listener is
+    started on the first record each process emits, so worker processes forked
+    after logging is configured get a listener of their own.
+    """
+
+    def __init__(self, filename, mode='a', encoding=None, delay=False):
+        super().__init__(queue.Queue(-1))
+        self.file_handler = logging.FileHandler(filename, mode, encoding, delay)
+        self.listener = None
+        self._listener_pid = None
+        self._listener_lock = threading.Lock()
+
+    def _ensure_listener(self):
+        """
+        Starts the listener thread if this process does not have one yet.
+        """
+        with self._listener_lock:
+            if self._listener_pid == os.getpid():
+                return
+            # A queue inherited through fork may hold a lock taken by a thread
+            # that no longer exists, so every process gets a fresh one
+            self.queue = queue.Queue(-1)
+            self.listener = QueueListener(self.queue, self.file_handler)
+            self.listener.start()
+            self._listener_pid = os.getpid()
+
+    def enqueue(self, record):
+        if self._listener_pid != os.getpid():
+            self._ensure_listener()
+        super().enqueue(record)
+
+    def close(self):
+        """
+        Writes out every queued record, then closes the log file.
+        """
+        with self._listener_lock:
+            if self.listener is not None and self._listener_pid == os.getpid():
+                self.listener.stop()
+            self.listener = None
+            self._listener_pid = None
+        self.file_handler.close()
+        super().close()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 import os
+import sys
 from pathlib import Path
 
 from decouple import config
@@ -111,6 +112,9 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD'),
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default='3306', cast=int), # Cast port to int
+        # Reuse connections across requests instead of reconnecting every time
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=600, cast=int),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -203,7 +207,7 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ),
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'auth_app.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -264,8 +268,36 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Cache
+# Short-lived state such as WebAuthn challenges lives here instead of the session table.
+# Redis is used when REDIS_CACHE_URL is set. Without it each process keeps its own
+# in-memory cache, so deployments running several workers should set REDIS_CACHE_URL.
+# Test runs always use the in-memory cache so they never clear a shared Redis database.
+REDIS_CACHE_URL = config('REDIS_CACHE_URL', default='')
+TESTING = sys.argv[1:2] == ['test'] or 'pytest' in sys.modules
+
+if REDIS_CACHE_URL and not TESTING:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'agbado',
+        }
+    }
+
 AUTH_USER_MODEL = 'auth_app.User'
 
+# Users sign in with either their email address or their phone number
+AUTHENTICATION_BACKENDS = [
+    'auth_app.backends.EmailOrPhoneBackend',
+]
+
 TERMII_LIVE_KEY = config('TERMII_LIVE_KEY')
 
 # File Upload Settings
@@ -289,7 +321,7 @@ LOGGING = {
     'handlers': {
         'file': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
+            'class': 'agbado.log_handlers.BackgroundFileHandler',
             'filename': BASE_DIR / 'agbado.log',
             'formatter': 'verbose',
         },
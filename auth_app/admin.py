@@ -32,7 +32,7 @@ class UserAdmin(admin.ModelAdmin):
     )
     search_fields = ('email', 'first_name', 'last_name', 'phone_number')
     ordering = ('-date_joined',)
-    readonly_fields = ('date_joined', 'referral_code')
+    readonly_fields = ('date_joined', 'referral_code', 'pin')
     fieldsets = (
         ('Personal Information', {
             'fields': ('email', 'first_name', 'last_name', 'phone_number', 'state')
@@ -213,7 +213,7 @@ class WebAuthnCredentialAdmin(admin.ModelAdmin):
     list_filter = ('transports', 'registered_at', 'last_used')
     search_fields = ('user__email', 'credential_id')
     ordering = ('-registered_at',)
-    readonly_fields = ('registered_at', 'last_used', 'sign_count')
+    readonly_fields = ('public_key', 'registered_at', 'last_used', 'sign_count')
     fieldsets = (
         ('Credential Information', {
             'fields': ('user', 'credential_id', 'public_key', 'transports')
@@ -0,0 +1,125 @@
+"""
+Authentication classes for the auth app.
+
+This module contains a token authentication class that serves tokens and
+their users from the cache instead of querying the database on every request.
+"""
+
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from .serializers import user_data_cache_key
+
+# How long an authenticated token and its user are kept in the cache (seconds)
+AUTH_CACHE_TIMEOUT = 300
+
+# How long the token key issued to a user is kept in the cache (seconds)
+USER_TOKEN_CACHE_TIMEOUT = 3600
+
+# User columns never loaded into a cached user, since the cache may be shared.
+# Code that needs them reads them on first access.
+UNCACHED_USER_FIELDS = ('password', 'pin')
+
+
+def auth_token_cache_key(key):
+    """
+    Builds the cache key holding an authentication token.
+
+    :param key: The token key sent by the client
+    :return: The cache key
+    """
+    return f"auth:token:{key}"
+
+
+def auth_user_cache_key(user_id):
+    """
+    Builds the cache key holding the user behind an authentication token.
+
+    :param user_id: The ID of the user
+    :return: The cache key
+    """
+    return f"auth:user:{user_id}"
+
+
+def user_token_cache_key(user_id):
+    """
+    Builds the cache key holding the token key issued to a user.
+
+    :param user_id: The ID of the user
+    :return: The cache key
+    """
+    return f"auth:user_token:{user_id}"
+
+
+def get_token_for_user(user):
+    """
+    Returns the key of the user's token, creating the token if needed.
+
+    Repeat logins are served from the cache; the entry is dropped when the
+    token is deleted.
+
+    :param user: The user signing in
+    :return: The token key
+    """
+    key = cache.get(user_token_cache_key(user.pk))
+    if key is None:
+        token, created = Token.objects.get_or_create(user=user)
+        key = token.key
+        cache.set(user_token_cache_key(user.pk), key, USER_TOKEN_CACHE_TIMEOUT)
+    return key
+
+
+def invalidate_cached_user(user_id):
+    """
+    Drops every cached copy of a user after their row has changed.
+
+    Called by the user signals and by views that change users with a
+    queryset update(), which sends no signals.
+
+    :param user_id: The ID of the user
+    """
+    cache.delete_many([auth_user_cache_key(user_id), user_data_cache_key(user_id)])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication backed by the cache.
+
+    The token and its user are cached separately so that a change to the user
+    only drops the user entry. Deleting a token or saving, deactivating or
+    deleting a user removes the matching entry, so revoked tokens and inactive
+    users are rejected straight away.
+
+    The cached user is loaded without its password and PIN hashes, and the
+    cached token without its user, so neither hash reaches the cache.
+    """
+
+    def authenticate_credentials(self, key):
+        token = cache.get(auth_token_cache_key(key))
+        user = cache.get(auth_user_cache_key(token.user_id)) if token is not None else None
+
+        if token is None or user is None:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related('user').defer(
+                    *(f'user__{field}' for field in UNCACHED_USER_FIELDS)
+                ).get(key=key)
+            except model.DoesNotExist:
+                raise AuthenticationFailed(_('Invalid token.'))
+            user = token.user
+
+            if user.is_active:
+                cache.set_many({
+                    auth_token_cache_key(key): model(key=token.key, user_id=token.user_id, created=token.created),
+                    auth_user_cache_key(user.pk): user,
+                }, AUTH_CACHE_TIMEOUT)
+        else:
+            token.user = user
+
+        if not user.is_active:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+
+        return (user, token)
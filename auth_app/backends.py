@@ -0,0 +1,97 @@
+"""
+Authentication backends for the auth app.
+
+This module contains the backend that lets users sign in with either their
+email address or their phone number.
+"""
+
+import hashlib
+import hmac
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models import Q
+
+UserModel = get_user_model()
+
+# How long a successful password check is remembered (seconds)
+VERIFIED_PASSWORD_TIMEOUT = 60
+
+# Successful password checks, kept in this process only so that nothing derived
+# from a password is ever written to a shared cache
+verified_passwords = LocMemCache('auth_app.verified_passwords', {
+    'TIMEOUT': VERIFIED_PASSWORD_TIMEOUT,
+    'OPTIONS': {'MAX_ENTRIES': 1000},
+})
+
+# Columns needed to check the password and build the login response
+LOGIN_FIELDS = (
+    'id', 'email', 'phone_number', 'password', 'is_active', 'pin', 'last_login',
+)
+
+
+def verified_password_key(user, password):
+    """
+    Builds the cache key remembering that a password matched a user's hash.
+
+    :param user: The user the password was checked against
+    :param password: The raw password
+    :return: The cache key
+    """
+    return hmac.new(
+        settings.SECRET_KEY.encode(),
+        f"{user.pk}:{user.password}:{password}".encode(),
+        hashlib.sha256,
+    ).hexdigest()
+
+
+class EmailOrPhoneBackend(ModelBackend):
+    """
+    Authenticates against either the email or the phone number of a user.
+
+    The identifier is resolved with a single query over both unique columns,
+    and a password is hashed even when no user matches, so both kinds of
+    identifier take the same time to reject.
+    """
+
+    def authenticate(self, request, identifier=None, password=None, username=None, **kwargs):
+        identifier = identifier or username or kwargs.get(UserModel.USERNAME_FIELD)
+        if identifier is None or password is None:
+            return None
+
+        user = UserModel._default_manager.filter(
+            Q(email=identifier) | Q(phone_number=identifier)
+        ).only(*LOGIN_FIELDS).first()
+
+        if user is None:
+            # Run the password hasher once to reduce the timing difference
+            # between an existing and a nonexistent user
+            UserModel().set_password(password)
+            return None
+
+        if self.check_password(user, password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+    def check_password(self, user, password):
+        """
+        Checks the password, skipping the hasher if it matched recently.
+
+        The cache key is an HMAC over the stored hash, so setting a new
+        password makes every remembered check for the user miss. Failed
+        checks are never remembered.
+
+        :param user: The user being authenticated
+        :param password: The raw password sent by the client
+        :return: True if the password is correct
+        """
+        if verified_passwords.get(verified_password_key(user, password)):
+            return True
+
+        if not user.check_password(password):
+            return False
+        # Key on the hash as stored now, since check_password() may upgrade it
+        verified_passwords.set(verified_password_key(user, password), True)
+        return True
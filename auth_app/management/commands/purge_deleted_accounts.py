@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from auth_app.models import User
+
+
+class Command(BaseCommand):
+    help = "Permanently remove accounts that were deleted by their owners more than --days ago."
+
+    def add_arguments(self, parser):
+        # Optional argument: how long deleted accounts are kept before purging
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Days to keep a deleted account before purging it (default 30).",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=max(0, options["days"]))
+        # Only accounts that are still deactivated; never a live account with a stale deleted_at
+        _, deleted_per_model = User.objects.filter(is_active=False, deleted_at__lte=cutoff).delete()
+        purged = deleted_per_model.get(User._meta.label, 0)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Purged {purged} deleted account(s).")
+        )
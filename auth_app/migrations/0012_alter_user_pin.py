@@ -0,0 +1,30 @@
+# Generated by Django 5.1.1 on 2026-10-17 09:12
+
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.db import migrations, models
+
+
+def hash_existing_pins(apps, schema_editor):
+    """Hash any PINs that were stored in plaintext."""
+    User = apps.get_model('auth_app', 'User')
+    for user in User.objects.exclude(pin__isnull=True).exclude(pin='').only('pk', 'pin'):
+        try:
+            identify_hasher(user.pin)
+        except ValueError:
+            User.objects.filter(pk=user.pk).update(pin=make_password(user.pin))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0011_alter_otp_expires_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='pin',
+            field=models.CharField(blank=True, help_text='Hashed PIN for additional security', max_length=128, null=True),
+        ),
+        migrations.RunPython(hash_existing_pins, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.1.1 on 2026-10-17 10:05
+
+import base64
+
+from django.db import migrations, models
+
+
+def decode_public_keys(apps, schema_editor):
+    """Decode the stored base64url public keys into raw bytes."""
+    WebAuthnCredential = apps.get_model('auth_app', 'WebAuthnCredential')
+    for credential in WebAuthnCredential.objects.only('pk', 'public_key'):
+        encoded = credential.public_key
+        WebAuthnCredential.objects.filter(pk=credential.pk).update(
+            public_key_bytes=base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+        )
+
+
+def encode_public_keys(apps, schema_editor):
+    """Encode the raw public keys back into base64url text."""
+    WebAuthnCredential = apps.get_model('auth_app', 'WebAuthnCredential')
+    for credential in WebAuthnCredential.objects.only('pk', 'public_key_bytes'):
+        WebAuthnCredential.objects.filter(pk=credential.pk).update(
+            public_key=base64.urlsafe_b64encode(bytes(credential.public_key_bytes)).decode('utf-8').rstrip('=')
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0012_alter_user_pin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webauthncredential',
+            name='public_key_bytes',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='webauthncredential',
+            name='public_key',
+            field=models.TextField(help_text='Base64URL encoded public key', null=True),
+        ),
+        migrations.RunPython(decode_public_keys, encode_public_keys),
+        migrations.RemoveField(
+            model_name='webauthncredential',
+            name='public_key',
+        ),
+        migrations.RenameField(
+            model_name='webauthncredential',
+            old_name='public_key_bytes',
+            new_name='public_key',
+        ),
+        migrations.AlterField(
+            model_name='webauthncredential',
+            name='public_key',
+            field=models.BinaryField(help_text='COSE-encoded credential public key'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-17 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0013_webauthncredential_public_key_bytes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='When the user deleted their account', null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.1 on 2026-10-17 11:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0014_user_deleted_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='otp',
+            index=models.Index(fields=['user', 'otp', 'is_used'], name='auth_app_ot_user_id_9c3150_idx'),
+        ),
+    ]
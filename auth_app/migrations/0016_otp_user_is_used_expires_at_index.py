@@ -0,0 +1,17 @@
+# Generated by Django 5.1.1 on 2026-10-17 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0015_otp_user_otp_is_used_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='otp',
+            index=models.Index(fields=['user', 'is_used', 'expires_at'], name='auth_app_ot_user_id_11b1f0_idx'),
+        ),
+    ]
@@ -112,10 +112,16 @@ class User(AbstractUser, PermissionsMixin):
         help_text="Is the user currently busy?"
     )
     pin = models.CharField(
-        max_length=6, 
+        max_length=128, 
         null=True, 
         blank=True, 
-        help_text="User's PIN for additional security"
+        help_text="Hashed PIN for additional security"
+    )
+    deleted_at = models.DateTimeField(
+        null=True, 
+        blank=True, 
+        db_index=True, 
+        help_text="When the user deleted their account"
     )
 
     objects = UserManager()
@@ -160,8 +166,8 @@ class WebAuthnCredential(models.Model):
         db_index=True, 
         help_text="Identifier for the credential"
     )
-    public_key = models.TextField(
-        help_text="Base64URL encoded public key"
+    public_key = models.BinaryField(
+        help_text="COSE-encoded credential public key"
     )
     sign_count = models.BigIntegerField(
         default=0, 
@@ -303,6 +309,10 @@ class OTP(models.Model):
         verbose_name = "OTP"
         verbose_name_plural = "OTPs"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'otp', 'is_used']),
+            models.Index(fields=['user', 'is_used', 'expires_at']),
+        ]
 
     def save(self, *args, **kwargs):
         """Set expiration time when creating OTP."""
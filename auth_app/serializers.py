@@ -8,8 +8,10 @@ for authentication-related models including users, KYC, OTP, and referrals.
 from datetime import timedelta
 
 from django.contrib.auth.base_user import BaseUserManager, AbstractBaseUser
-from django.db import models
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, models
 from django.contrib.auth.models import AbstractUser, PermissionsMixin
+from django.core.cache import cache
 from django.utils import timezone
 
 from rest_framework import serializers
@@ -22,6 +24,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# How long a user's serialized data is kept in the cache (seconds)
+USER_DATA_CACHE_TIMEOUT = 600
+
 
 class UserSerializer(serializers.ModelSerializer):
     """
@@ -37,6 +42,7 @@ class UserSerializer(serializers.ModelSerializer):
         fields = "__all__"
         extra_kwargs = {
             'password': {'write_only': True},
+            'pin': {'write_only': True},
             'email': {'required': True},
             'phone_number': {'required': True}
         }
@@ -89,16 +95,22 @@ class UserSerializer(serializers.ModelSerializer):
             if not validated_data.get('referral_code'):
                 validated_data['referral_code'] = generate_unique_referral_code()
             
-            # Remove password from validated_data and create user
+            # Hash the password and PIN on the unsaved instance so creation is a single INSERT
             password = validated_data.pop('password', None)
-            user = User.objects.create(**validated_data)
+            pin = validated_data.pop('pin', None)
+            user = User(**validated_data)
             if password:
                 user.set_password(password)
-                user.save()
+            if pin:
+                user.pin = make_password(pin)
+            user.save()
             
             logger.info(f"User created successfully: {user.email}")
             return user
             
+        except IntegrityError:
+            # Let callers turn a lost uniqueness race into their own response
+            raise
         except Exception as e:
             logger.error(f"Error creating user: {str(e)}")
             raise serializers.ValidationError(f"Error creating user: {str(e)}")
@@ -107,7 +119,7 @@ class UserSerializer(serializers.ModelSerializer):
         """
         Update an existing user instance.
         
-        Handles profile picture upload and password updates.
+        Handles profile picture upload and password and PIN updates.
         """
         try:
             # Check if 'profile_picture' was sent in the FILES dictionary
@@ -124,9 +136,13 @@ class UserSerializer(serializers.ModelSerializer):
             if password:
                 instance.set_password(password)
 
-            # Update other fields
+            # The PIN is stored hashed, like the password
+            pin = validated_data.pop('pin', None)
+            if pin:
+                instance.pin = make_password(pin)
+
+            # Update other fields; ModelSerializer.update() saves the instance, password included
             updated_instance = super().update(instance, validated_data)
-            updated_instance.save()
             
             logger.info(f"User updated successfully: {updated_instance.email}")
             return updated_instance
@@ -136,6 +152,66 @@ class UserSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(f"Error updating user: {str(e)}")
 
 
+class UserRegistrationSerializer(UserSerializer):
+    """
+    Serializer for creating users at registration.
+    
+    Leaves email and phone number uniqueness to the database's unique
+    constraints instead of querying for each before the insert.
+    """
+    class Meta(UserSerializer.Meta):
+        extra_kwargs = {
+            **UserSerializer.Meta.extra_kwargs,
+            'email': {'required': True, 'validators': []},
+            'phone_number': {'required': True, 'validators': []},
+        }
+
+    def validate_email(self, value):
+        return value
+
+    def validate_phone_number(self, value):
+        return value
+
+
+class RegistrationResponseSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the user returned after registration.
+    
+    Limited to the fields the client needs once an account is created.
+    """
+    class Meta:
+        model = User
+        fields = ('id', 'email', 'phone_number', 'first_name', 'last_name', 'is_service_provider')
+        read_only_fields = fields
+
+
+def user_data_cache_key(user_id):
+    """
+    Builds the cache key holding a user's serialized data.
+
+    :param user_id: The ID of the user
+    :return: The cache key
+    """
+    return f"user:data:{user_id}"
+
+
+def get_user_data(user):
+    """
+    Returns the UserSerializer representation of a user, served from the cache when possible.
+
+    The entry is dropped whenever the user is saved or deleted, and by views
+    that change user fields with a queryset update().
+
+    :param user: The user to serialize
+    :return: The serialized user data
+    """
+    return cache.get_or_set(
+        user_data_cache_key(user.pk),
+        lambda: dict(UserSerializer(user).data),
+        USER_DATA_CACHE_TIMEOUT
+    )
+
+
 class KYCSerializer(serializers.ModelSerializer):
     """
     Serializer for KYC model.
@@ -1,7 +1,12 @@
-from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.core.signals import request_finished, request_started
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
 from wallet_app.services import create_dedicated_account_for_user
+from auth_app.authentication import auth_token_cache_key, invalidate_cached_user, user_token_cache_key
 from auth_app.models import User
+from auth_app.utils import send_queued_otps, start_otp_deliveries
 
 @receiver(post_save, sender=User)
 def create_dedicated_account_on_signup(sender, instance, created, **kwargs):
@@ -11,4 +16,25 @@ def create_dedicated_account_on_signup(sender, instance, created, **kwargs):
             create_dedicated_account_for_user(instance)
         except Exception as e:
             # TODO: log / enqueue retry
-            pass
\ No newline at end of file
+            pass
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_caches(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_auth_token_cache(sender, instance, **kwargs):
+    cache.delete_many([auth_token_cache_key(instance.key), user_token_cache_key(instance.user_id)])
+
+
+@receiver(request_started)
+def begin_otp_deliveries(sender, **kwargs):
+    start_otp_deliveries()
+
+
+@receiver(request_finished)
+def deliver_queued_otps(sender, **kwargs):
+    send_queued_otps()
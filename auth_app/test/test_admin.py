@@ -49,7 +49,7 @@ class AdminTests(TestCase):
         self.webauthn_instance = WebAuthnCredential.objects.create(
             user=self.user,
             credential_id='test-id-12345678901234567890abcdef',
-            public_key='test-public-key'
+            public_key=b'test-public-key'
         )
         
         # Instantiate admin site and model admin classes
@@ -202,7 +202,7 @@ class WebAuthnCredentialAdminTests(TestCase):
         self.credential = WebAuthnCredential.objects.create(
             user=self.user,
             credential_id='test-id-12345678901234567890abcdef',
-            public_key='test-public-key'
+            public_key=b'test-public-key'
         )
         self.webauthn_admin = WebAuthnCredentialAdmin(WebAuthnCredential, AdminSite())
 
@@ -0,0 +1,104 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from django.contrib.auth.hashers import make_password
+
+from auth_app.authentication import (
+    CachedTokenAuthentication, auth_token_cache_key, auth_user_cache_key, get_token_for_user
+)
+from auth_app.models import User
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """
+    Tests for the cache-backed token authentication class.
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='authuser@example.com',
+            phone_number='2348012345678',
+            password='testpassword123'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.authentication = CachedTokenAuthentication()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_repeat_authentication_served_from_cache(self):
+        """Test a second authentication with the same token runs no queries."""
+        user, token = self.authentication.authenticate_credentials(self.token.key)
+        self.assertEqual(user, self.user)
+
+        with self.assertNumQueries(0):
+            user, token = self.authentication.authenticate_credentials(self.token.key)
+        self.assertEqual(user, self.user)
+        self.assertEqual(token.user, self.user)
+
+    def test_cached_entries_hold_no_hashes(self):
+        """Test neither the password nor the PIN hash is written to the cache."""
+        User.objects.filter(pk=self.user.pk).update(pin=make_password('123456'))
+        user, token = self.authentication.authenticate_credentials(self.token.key)
+
+        cached_user = cache.get(auth_user_cache_key(self.user.pk))
+        self.assertNotIn('password', cached_user.__dict__)
+        self.assertNotIn('pin', cached_user.__dict__)
+        cached_token = cache.get(auth_token_cache_key(self.token.key))
+        self.assertFalse(cached_token._state.fields_cache)
+
+        # The hashes are still read from the database when a view needs them
+        self.assertTrue(user.check_password('testpassword123'))
+        self.assertIsNotNone(user.pin)
+
+    def test_deleted_token_rejected(self):
+        """Test a token deleted after being cached can no longer authenticate."""
+        self.authentication.authenticate_credentials(self.token.key)
+        self.token.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(self.token.key)
+
+    def test_deactivated_user_rejected(self):
+        """Test a user deactivated after being cached can no longer authenticate."""
+        self.authentication.authenticate_credentials(self.token.key)
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(self.token.key)
+
+
+class GetTokenForUserTests(TestCase):
+    """
+    Tests for the cached token lookup used at login.
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='tokenuser@example.com',
+            phone_number='2348012345679',
+            password='testpassword123'
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_repeat_lookup_served_from_cache(self):
+        """Test the token key is created once and then served without queries."""
+        key = get_token_for_user(self.user)
+        self.assertEqual(Token.objects.get(user=self.user).key, key)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_token_for_user(self.user), key)
+
+    def test_deleted_token_replaced(self):
+        """Test a new token is issued once the cached one has been deleted."""
+        key = get_token_for_user(self.user)
+        Token.objects.filter(user=self.user).delete()
+
+        new_key = get_token_for_user(self.user)
+        self.assertNotEqual(new_key, key)
+        self.assertTrue(Token.objects.filter(key=new_key, user=self.user).exists())
@@ -0,0 +1,59 @@
+from unittest import mock
+
+from django.contrib.auth import authenticate
+from django.test import TestCase
+
+from auth_app.backends import verified_passwords
+from auth_app.models import User
+
+
+class EmailOrPhoneBackendTests(TestCase):
+    """
+    Tests for the email-or-phone authentication backend.
+    """
+    def setUp(self):
+        verified_passwords.clear()
+        self.user = User.objects.create_user(
+            email='backenduser@example.com',
+            phone_number='2348012345678',
+            password='testpassword123'
+        )
+
+    def test_authenticate_with_email_or_phone(self):
+        """Test a user can authenticate with either identifier in a single query."""
+        for identifier in (self.user.email, self.user.phone_number):
+            with self.assertNumQueries(1):
+                user = authenticate(identifier=identifier, password='testpassword123')
+            self.assertEqual(user, self.user)
+
+    def test_authenticate_wrong_password(self):
+        """Test a wrong password is rejected."""
+        self.assertIsNone(authenticate(identifier=self.user.email, password='wrongpassword'))
+
+    def test_authenticate_unknown_identifier(self):
+        """Test an identifier that matches no user is rejected."""
+        self.assertIsNone(authenticate(identifier='2349999999999', password='testpassword123'))
+
+    def test_authenticate_inactive_user(self):
+        """Test an inactive user cannot authenticate."""
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(authenticate(identifier=self.user.phone_number, password='testpassword123'))
+
+    def test_repeat_login_skips_password_hasher(self):
+        """Test a password that just matched is not hashed again."""
+        authenticate(identifier=self.user.email, password='testpassword123')
+
+        with mock.patch.object(User, 'check_password') as mock_check_password:
+            user = authenticate(identifier=self.user.email, password='testpassword123')
+        self.assertEqual(user, self.user)
+        mock_check_password.assert_not_called()
+
+    def test_password_change_forgets_verified_password(self):
+        """Test the old password stops working as soon as a new one is set."""
+        authenticate(identifier=self.user.email, password='testpassword123')
+        self.user.set_password('newpassword456')
+        self.user.save()
+
+        self.assertIsNone(authenticate(identifier=self.user.email, password='testpassword123'))
+        self.assertEqual(authenticate(identifier=self.user.email, password='newpassword456'), self.user)
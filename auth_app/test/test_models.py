@@ -95,7 +95,7 @@ class WebAuthnCredentialTests(TestCase):
         credential = WebAuthnCredential.objects.create(
             user=self.user,
             credential_id='test-id-123',
-            public_key='test-public-key-base64',
+            public_key=b'test-public-key',
             transports='usb'
         )
         self.assertEqual(credential.user, self.user)
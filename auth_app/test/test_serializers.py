@@ -2,6 +2,8 @@
 from unittest.mock import patch, MagicMock
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password
+from django.core.cache import cache
 from rest_framework.test import APIRequestFactory
 from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework import serializers
@@ -9,7 +11,7 @@ from rest_framework import serializers
 # Import models, serializers, and external utilities
 from auth_app.models import User, KYC, OTP, Referral
 from auth_app.serializers import (
-    UserSerializer, KYCSerializer, OTPSerializer, ReferralSerializer
+    UserSerializer, KYCSerializer, OTPSerializer, ReferralSerializer, get_user_data
 )
 from auth_app.utils import generate_unique_referral_code
 from wallet_app.services import update_bvn_on_reserved_account
@@ -97,6 +99,31 @@ class UserSerializerTests(SerializerTests):
         self.assertFalse(serializer.is_valid())
         self.assertIn('User with this phone number already exists.', str(serializer.errors))
 
+    def test_pin_is_write_only_and_hashed(self):
+        """Test the PIN is hashed when written and never included in the output."""
+        serializer = UserSerializer(self.user, data={'pin': '123456'}, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        user = serializer.save()
+
+        user.refresh_from_db()
+        self.assertNotEqual(user.pin, '123456')
+        self.assertTrue(check_password('123456', user.pin))
+        self.assertNotIn('pin', UserSerializer(user).data)
+        self.assertNotIn('pin', get_user_data(user))
+
+    def test_get_user_data_cached_until_user_saved(self):
+        """Test serialized user data is served from the cache and refreshed after a save."""
+        cache.clear()
+        self.assertEqual(get_user_data(self.user)['email'], 'testuser@example.com')
+
+        with patch('auth_app.serializers.UserSerializer') as mock_serializer:
+            self.assertEqual(get_user_data(self.user)['email'], 'testuser@example.com')
+            mock_serializer.assert_not_called()
+
+        self.user.state = 'Oyo'
+        self.user.save()
+        self.assertEqual(get_user_data(self.user)['state'], 'Oyo')
+
 class KYCSerializerTests(SerializerTests):
     """
     Tests for the KYCSerializer.
@@ -1,4 +1,5 @@
 # auth_app/test_utils.py
+import contextvars
 import string
 from unittest.mock import patch, mock_open, MagicMock
 from django.test import TestCase
@@ -15,7 +16,12 @@ from auth_app.utils import (
     generate_otp,
     create_otp,
     send_otp_email,
+    queue_otp,
+    send_queued_otps,
+    start_otp_deliveries,
     format_phone_number,
+    base64url_decode,
+    base64url_encode,
     send_otp_sms,
     write_to_file,
     log_to_server,
@@ -81,6 +87,17 @@ class UtilityFunctionTests(TestCase):
         self.assertEqual(len(otp_instance.otp), 5)
         self.assertGreater(otp_instance.expires_at, timezone.now())
 
+    def test_create_otp_retires_unused_otps(self):
+        """
+        Test that create_otp leaves only the newest OTP usable.
+        """
+        old_otp = create_otp(self.user)
+        new_otp = create_otp(self.user)
+
+        old_otp.refresh_from_db()
+        self.assertTrue(old_otp.is_used)
+        self.assertFalse(OTP.objects.get(pk=new_otp.pk).is_used)
+
     def test_send_otp_email(self):
         """
         Test that send_otp_email correctly sends an email.
@@ -96,6 +113,38 @@ class UtilityFunctionTests(TestCase):
         self.assertEqual(email.body, 'Your OTP to reset your password is: 12345')
         self.assertEqual(email.to, ['testuser@example.com'])
 
+    def test_queue_otp_waits_for_request_end(self):
+        """
+        Test that an OTP queued during a request is only sent once it is flushed.
+        """
+        sender = MagicMock()
+        start_otp_deliveries()
+        queue_otp(sender, self.user, '12345')
+        sender.assert_not_called()
+
+        self.assertEqual(send_queued_otps(), 1)
+        sender.assert_called_once_with(self.user, '12345')
+
+        # Outside a request the OTP goes out straight away
+        queue_otp(sender, self.user, '67890')
+        sender.assert_called_with(self.user, '67890')
+
+    def test_queued_otps_are_separate_per_request_context(self):
+        """
+        Test that another request on the same thread neither drops nor sends this request's OTPs.
+        """
+        sender = MagicMock()
+        start_otp_deliveries()
+        queue_otp(sender, self.user, '12345')
+
+        other_request = contextvars.Context()
+        other_request.run(start_otp_deliveries)
+        self.assertEqual(other_request.run(send_queued_otps), 0)
+        sender.assert_not_called()
+
+        self.assertEqual(send_queued_otps(), 1)
+        sender.assert_called_once_with(self.user, '12345')
+
 class PhoneNumberTests(TestCase):
     """
     Tests for the format_phone_number utility function.
@@ -128,6 +177,15 @@ class PhoneNumberTests(TestCase):
         formatted_number = format_phone_number('  +234 (80) 123-456-78 ')
         self.assertEqual(formatted_number, '2348012345678')
 
+    def test_base64url_round_trip(self):
+        """
+        Test unpadded base64url values of every length decode back to the original bytes.
+        """
+        for data in (b'', b'a', b'ab', b'abc', b'\xfb\xff\xfe'):
+            encoded = base64url_encode(data)
+            self.assertNotIn('=', encoded)
+            self.assertEqual(base64url_decode(encoded), data)
+
 @patch('auth_app.utils.requests.post')
 @patch('auth_app.utils.config')
 class TermiiAPITests(TestCase):
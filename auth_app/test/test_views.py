@@ -1,15 +1,26 @@
 import base64
 import json
+from datetime import timedelta
+from io import StringIO
 from unittest import mock
 
 from django.urls import reverse
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory, APITestCase
 from rest_framework.authtoken.models import Token
 from django.conf import settings
+from django.core.management import call_command
+from django.core.cache import cache
+from django.utils import timezone
+from django.contrib.auth.hashers import check_password, make_password
 from faker import Faker
 
 from auth_app.models import User as CustomUser, OTP, Referral, WebAuthnCredential
+from auth_app.views import (
+    get_user_from_token, otp_rate_limit_cache_key, webauthn_authentication_challenge_key, webauthn_registration_challenge_key
+)
+from notification_app.models import Notification
 from user_app.models import UserReward
 from django.db import transaction, DatabaseError
 
@@ -30,7 +41,7 @@ class AuthViewsTest(APITestCase):
             "first_name": fake.first_name(),
             "last_name": fake.last_name(),
             "email": fake.email(),
-            "phone_number": fake.phone_number(),
+            "phone_number": fake.numerify("234##########"),
             "password": "password123",
         }
         self.user = CustomUser.objects.create_user(**self.user_data)
@@ -70,6 +81,7 @@ class AuthViewsTest(APITestCase):
         Clean up mocks after each test.
         """
         mock.patch.stopall()
+        cache.clear()
 
     # --- Registration Views Tests ---
 
@@ -89,6 +101,9 @@ class AuthViewsTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertTrue('token' in response.data)
         self.assertTrue(CustomUser.objects.get(email=data['email']).is_service_provider)
+        self.assertEqual(response.data['user']['email'], data['email'])
+        self.assertTrue(response.data['user']['is_service_provider'])
+        self.assertNotIn('pin', response.data['user'])
         # self.mock_send_email.assert_called_once()
         # self.mock_send_sms.assert_called_once()
         
@@ -126,11 +141,29 @@ class AuthViewsTest(APITestCase):
             "email": self.user.email,
             "phone": "9998887778",
             "password": "newpassword123",
+            "state": "Lagos",
         }
         response = self.client.post(self.register_user_url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("A user with this email already exists.", response.data['message'])
 
+    def test_register_user_duplicate_phone_number(self):
+        """
+        Test registration fails with a duplicate phone number.
+        """
+        data = {
+            "first_name": "New",
+            "last_name": "User",
+            "email": "newuser@example.com",
+            "phone": self.user.phone_number,
+            "password": "newpassword123",
+            "state": "Lagos",
+        }
+        response = self.client.post(self.register_user_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("A user with this phone number already exists.", response.data['message'])
+        self.assertFalse(CustomUser.objects.filter(email="newuser@example.com").exists())
+
     def test_register_user_missing_fields(self):
         """
         Test registration fails with missing required fields.
@@ -155,6 +188,43 @@ class AuthViewsTest(APITestCase):
         self.mock_send_email.assert_called_once()
         self.mock_send_sms.assert_not_called()
     
+    def test_send_otp_rate_limited(self):
+        """
+        Test a second OTP request within the rate limit window is rejected.
+        """
+        data = {"identifier": self.user.email}
+        self.client.post(self.send_otp_url, data, format='json')
+        response = self.client.post(self.send_otp_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(OTP.objects.filter(user=self.user).count(), 1)
+        self.mock_send_email.assert_called_once()
+
+    def test_send_otp_hourly_limit(self):
+        """
+        Test OTP requests for one identifier stop being served after the hourly limit.
+        """
+        data = {"identifier": self.user.email}
+        for _ in range(3):
+            cache.delete(otp_rate_limit_cache_key(self.user.id))
+            self.client.post(self.send_otp_url, data, format='json')
+
+        with self.assertNumQueries(0):
+            response = self.client.post(self.send_otp_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(OTP.objects.filter(user=self.user).count(), 3)
+
+    def test_send_otp_hourly_limit_is_per_client(self):
+        """
+        Test one client using up an identifier's hourly limit doesn't lock out other clients.
+        """
+        data = {"identifier": self.user.email}
+        for _ in range(4):
+            self.client.post(self.forgot_password_url, data, format='json', REMOTE_ADDR='203.0.113.7')
+
+        cache.delete(otp_rate_limit_cache_key(self.user.id))
+        response = self.client.post(self.send_otp_url, data, format='json', REMOTE_ADDR='198.51.100.20')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
     def test_verify_otp_success(self):
         """
         Test successful OTP verification.
@@ -167,6 +237,26 @@ class AuthViewsTest(APITestCase):
         self.assertTrue(self.user.is_verified)
         self.assertTrue(OTP.objects.get(id=otp_instance.id).is_used)
 
+    def test_verify_otp_success_phone(self):
+        """
+        Test OTP verification with a phone number identifier.
+        """
+        OTP.objects.create(user=self.user, otp='123456')
+        data = {"identifier": self.user.phone_number, "otp": "123456"}
+        response = self.client.post(self.verify_otp_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.is_verified)
+
+    def test_verify_otp_unknown_identifier(self):
+        """
+        Test OTP verification fails for an identifier that matches no user.
+        """
+        data = {"identifier": "unknown@example.com", "otp": "123456"}
+        response = self.client.post(self.verify_otp_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("does not exist", response.data['message'])
+
     def test_verify_otp_invalid(self):
         """
         Test OTP verification fails with an invalid OTP.
@@ -177,6 +267,31 @@ class AuthViewsTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("Invalid OTP.", response.data['message'])
 
+    def test_verify_otp_reuse_rejected(self):
+        """
+        Test an OTP can only be used once.
+        """
+        OTP.objects.create(user=self.user, otp='123456')
+        data = {"identifier": self.user.email, "otp": "123456"}
+        self.assertEqual(self.client.post(self.verify_otp_url, data, format='json').status_code,
+                         status.HTTP_200_OK)
+        response = self.client.post(self.verify_otp_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Invalid OTP.", response.data['message'])
+
+    def test_verify_otp_expired(self):
+        """
+        Test an expired OTP is rejected as invalid.
+        """
+        OTP.objects.create(user=self.user, otp='123456',
+                           expires_at=timezone.now() - timedelta(minutes=1))
+        data = {"identifier": self.user.email, "otp": "123456"}
+        response = self.client.post(self.verify_otp_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Invalid OTP.", response.data['message'])
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_verified)
+
     # --- PIN Views Tests ---
     
     def test_pin_registration_success(self):
@@ -187,25 +302,34 @@ class AuthViewsTest(APITestCase):
         response = self.client.post(self.pin_reg_url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.user.refresh_from_db()
-        self.assertEqual(self.user.pin, "123456")
+        self.assertTrue(check_password("123456", self.user.pin))
+
+    def test_pin_registration_rejects_non_ascii_digits(self):
+        """
+        Test PIN registration fails for digits outside ASCII.
+        """
+        data = {"pin": "١٢٣٤٥٦"}
+        response = self.client.post(self.pin_reg_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("PIN must be a 6-digit number.", response.data['message'])
 
     def test_pin_update_success(self):
         """
         Test successful PIN update.
         """
-        self.user.pin = "111111"
+        self.user.pin = make_password("111111")
         self.user.save()
         data = {"pin": "654321"}
         response = self.client.put(self.pin_update_url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.user.refresh_from_db()
-        self.assertEqual(self.user.pin, "654321")
+        self.assertTrue(check_password("654321", self.user.pin))
         
     def test_pin_auth_success(self):
         """
         Test successful PIN authentication.
         """
-        self.user.pin = "123456"
+        self.user.pin = make_password("123456")
         self.user.save()
         data = {"pin": "123456"}
         response = self.client.post(self.pin_auth_url, data, format='json')
@@ -216,7 +340,7 @@ class AuthViewsTest(APITestCase):
         """
         Test PIN authentication fails with an invalid PIN.
         """
-        self.user.pin = "123456"
+        self.user.pin = make_password("123456")
         self.user.save()
         data = {"pin": "999999"}
         response = self.client.post(self.pin_auth_url, data, format='json')
@@ -234,6 +358,9 @@ class AuthViewsTest(APITestCase):
         response = self.client.post(self.login_url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTrue('token' in response.data)
+        self.assertNotIn('_auth_user_id', self.client.session)
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.last_login)
 
     def test_login_success_phone(self):
         """
@@ -253,6 +380,14 @@ class AuthViewsTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertFalse(Token.objects.filter(user=self.user).exists())
 
+    def test_logout_revokes_token(self):
+        """
+        Test the token cannot be used again after logging out.
+        """
+        self.assertEqual(self.client.post(self.logout_url).status_code, status.HTTP_200_OK)
+        response = self.client.post(self.logout_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
     # --- Password Reset Tests ---
     
     def test_forgot_password_success(self):
@@ -263,6 +398,28 @@ class AuthViewsTest(APITestCase):
         response = self.client.post(self.forgot_password_url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.mock_send_email.assert_called_once()
+
+    def test_forgot_password_repeat_request_rejected(self):
+        """
+        Test a second forgot password request is rejected while the first OTP is active.
+        """
+        data = {"identifier": self.user.email}
+        self.client.post(self.forgot_password_url, data, format='json')
+        response = self.client.post(self.forgot_password_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("An OTP was already sent.", response.data['message'])
+        self.assertEqual(OTP.objects.filter(user=self.user).count(), 1)
+
+    def test_forgot_password_expired_otp_allows_new_request(self):
+        """
+        Test an expired, unused OTP does not block a new forgot password request.
+        """
+        OTP.objects.create(user=self.user, otp='123456',
+                           expires_at=timezone.now() - timedelta(minutes=1))
+        data = {"identifier": self.user.email}
+        response = self.client.post(self.forgot_password_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.mock_send_email.assert_called_once()
         
     def test_reset_password_success(self):
         """
@@ -274,6 +431,16 @@ class AuthViewsTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.user.refresh_from_db()
         self.assertTrue(self.user.check_password(new_password))
+        self.assertTrue(Notification.objects.filter(user=self.user, title="Password Reset Successful").exists())
+
+    def test_reset_password_unknown_identifier(self):
+        """
+        Test password reset is rejected for an identifier that matches no user.
+        """
+        data = {"identifier": "2349999999999", "new_password": "new_secure_password"}
+        response = self.client.post(self.reset_password_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("does not exist", response.data['message'])
 
     # --- Account Management Tests ---
     
@@ -289,9 +456,9 @@ class AuthViewsTest(APITestCase):
         self.user.refresh_from_db()
         self.assertTrue(self.user.is_busy)
         
-    def test_social_auth_login_existing_user(self):
+    def test_social_auth_does_not_issue_token_for_unverified_email(self):
         """
-        Test social authentication for an existing user.
+        Test social authentication refuses to sign in by a posted email alone.
         """
         self.client.credentials()
         data = {
@@ -300,8 +467,8 @@ class AuthViewsTest(APITestCase):
             "last_name": self.user.last_name,
         }
         response = self.client.post(self.google_apple_auth_url, data, format='json')
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIn("Login successful", response.data['message'])
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+        self.assertNotIn('token', response.data)
         
     # --- WebAuthn Tests ---
 
@@ -318,8 +485,7 @@ class AuthViewsTest(APITestCase):
         response = self.client.post(self.start_webauthn_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('publicKeyCredentialCreationOptions', response.data)
-        self.assertEqual(self.client.session['challenge'], base64.urlsafe_b64encode(b'mock_challenge_bytes').decode('utf-8').rstrip("="))
-        self.assertEqual(self.client.session['user_id_for_webauthn_reg'], str(self.user.id))
+        self.assertEqual(cache.get(webauthn_registration_challenge_key(self.user.id)), b'mock_challenge_bytes')
 
     def test_complete_webauthn_registration_success(self):
         """
@@ -328,9 +494,8 @@ class AuthViewsTest(APITestCase):
         # Correctly mock the `verify_registration_response` function
         with mock.patch('auth_app.views.verify_registration_response') as mock_verify:
             
-            # Mock the session data that the view will check
-            self.client.session['challenge'] = 'mocked_challenge'
-            self.client.session['user_id_for_webauthn_reg'] = str(self.user.id)
+            # Store the challenge that the view will check
+            cache.set(webauthn_registration_challenge_key(self.user.id), b'mocked_challenge')
             
             # Mock the verification result object the function should return
             mock_verification_result = mock.Mock()
@@ -360,9 +525,8 @@ class AuthViewsTest(APITestCase):
             self.assertIn('WebAuthn credential registered successfully.', str(response.content))
             self.assertEqual(WebAuthnCredential.objects.count(), 1)
             
-            # Verify that session data has been popped
-            self.assertIsNone(self.client.session.get('challenge'))
-            self.assertIsNone(self.client.session.get('user_id_for_webauthn_reg'))
+            # Verify that the challenge has been consumed
+            self.assertIsNone(cache.get(webauthn_registration_challenge_key(self.user.id)))
 
     def test_complete_webauthn_registration_no_challenge(self):
         """
@@ -382,9 +546,8 @@ class AuthViewsTest(APITestCase):
         """
         # Mock the verification function to raise a specific error
         with mock.patch('auth_app.views.verify_registration_response', side_effect=ValueError("Invalid signature")):
-            # Set the session data to ensure the view reaches the verification step
-            self.client.session['challenge'] = 'mocked_challenge'
-            self.client.session['user_id_for_webauthn_reg'] = str(self.user.id)
+            # Store the challenge to ensure the view reaches the verification step
+            cache.set(webauthn_registration_challenge_key(self.user.id), b'mocked_challenge')
             
             # Provide a dummy JSON payload
             client_data = {
@@ -413,7 +576,7 @@ class AuthViewsTest(APITestCase):
         WebAuthnCredential.objects.create(
             user=self.user,
             credential_id="mocked_cred_id",
-            public_key="mocked_public_key",
+            public_key=b"mocked_public_key",
             sign_count=1
         )
         self.client.credentials() # Test this view as unauthenticated
@@ -432,8 +595,7 @@ class AuthViewsTest(APITestCase):
             
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertIn('publicKeyCredentialRequestOptions', response.json())
-            self.assertIsNotNone(self.client.session.get('challenge'))
-            self.assertEqual(self.client.session.get('user_id_for_webauthn_auth'), str(self.user.id))
+            self.assertEqual(cache.get(webauthn_authentication_challenge_key(self.user.id)), b'auth_challenge')
 
     def test_start_webauthn_authentication_no_credentials(self):
         """
@@ -449,21 +611,34 @@ class AuthViewsTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('No WebAuthn credentials registered', str(response.content))
 
+    def test_start_webauthn_authentication_unknown_user(self):
+        """
+        Test starting authentication for an email with no account.
+        """
+        self.client.credentials() # Test this view as unauthenticated
+        response = self.client.post(
+            self.start_webauthn_auth_url, 
+            data={'email': 'nobody@example.com'}, 
+            format='json'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertIn('User not found.', str(response.content))
+
     def test_complete_webauthn_authentication_success(self):
         """
         Test successful completion of WebAuthn authentication.
         """
         self.client.credentials() # Test this view as unauthenticated
         
-        # Create a credential and set session data
+        # Create a credential and store the challenge the view will check
         cred = WebAuthnCredential.objects.create(
             user=self.user,
             credential_id="mocked_cred_id",
-            public_key="mocked_public_key",
+            public_key=b"mocked_public_key",
             sign_count=1
         )
-        self.client.session['challenge'] = 'mocked_challenge'
-        self.client.session['user_id_for_webauthn_auth'] = str(self.user.id)
+        cache.set(webauthn_authentication_challenge_key(self.user.id), b'mocked_challenge')
         
         # Correctly mock the `verify_authentication_response` function
         with mock.patch('auth_app.views.verify_authentication_response') as mock_verify:
@@ -473,10 +648,10 @@ class AuthViewsTest(APITestCase):
             mock_verification_result.new_sign_count = 2
             mock_verify.return_value = mock_verification_result
             
-            # Provide a dummy JSON payload
+            # Provide a dummy JSON payload signed with the stored credential
             client_data = {
-                "id": "mock_cred_id",
-                "rawId": "mock_raw_id",
+                "id": "mocked_cred_id",
+                "rawId": "mocked_cred_id",
                 "response": {
                     "clientDataJSON": "mock_client_data",
                     "authenticatorData": "mock_authenticator_data",
@@ -498,8 +673,48 @@ class AuthViewsTest(APITestCase):
             cred.refresh_from_db()
             self.assertEqual(cred.sign_count, 2)
             
-            # Verify session data has been cleared
-            self.assertIsNone(self.client.session.get('challenge'))
+            # Verify that the challenge has been consumed
+            self.assertIsNone(cache.get(webauthn_authentication_challenge_key(self.user.id)))
+
+    def test_deleted_account_cannot_complete_webauthn_authentication(self):
+        """
+        Test a deleted account's leftover credential can't be used to log in.
+        """
+        WebAuthnCredential.objects.create(
+            user=self.user,
+            credential_id="mocked_cred_id",
+            public_key=b"mocked_public_key",
+            sign_count=1
+        )
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=False, deleted_at=timezone.now())
+        Token.objects.filter(user=self.user).delete()
+        cache.set(webauthn_authentication_challenge_key(self.user.id), b'mocked_challenge')
+        self.client.credentials()
+
+        response = self.client.post(self.start_webauthn_auth_url, data={'email': self.user.email}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        client_data = {
+            "id": "mocked_cred_id",
+            "rawId": "mocked_cred_id",
+            "response": {
+                "clientDataJSON": "mock_client_data",
+                "authenticatorData": "mock_authenticator_data",
+                "signature": "mock_signature"
+            },
+            "type": "public-key"
+        }
+        with mock.patch('auth_app.views.verify_authentication_response') as mock_verify:
+            response = self.client.post(
+                self.complete_webauthn_auth_url,
+                data=json.dumps(client_data),
+                content_type='application/json'
+            )
+            mock_verify.assert_not_called()
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('token', response.json())
+        self.assertFalse(Token.objects.filter(user=self.user).exists())
 
     def test_delete_webauthn_credential_success(self):
         """
@@ -508,7 +723,7 @@ class AuthViewsTest(APITestCase):
         cred = WebAuthnCredential.objects.create(
             user=self.user,
             credential_id="to_be_deleted",
-            public_key="some_key",
+            public_key=b"some_key",
             sign_count=1
         )
         response = self.client.delete(reverse(self.delete_webauthn_url_name, kwargs={'pk': cred.pk}))
@@ -529,14 +744,38 @@ class AuthViewsTest(APITestCase):
         """
         Test successful listing of WebAuthn credentials.
         """
-        WebAuthnCredential.objects.create(user=self.user, credential_id="cred1", public_key="key1", sign_count=1)
-        WebAuthnCredential.objects.create(user=self.user, credential_id="cred2", public_key="key2", sign_count=1)
+        WebAuthnCredential.objects.create(user=self.user, credential_id="cred1", public_key=b"key1", sign_count=1)
+        WebAuthnCredential.objects.create(user=self.user, credential_id="cred2", public_key=b"key2", sign_count=1)
         
         response = self.client.get(self.list_webauthn_url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.json()['credentials']), 2)
 
+    def test_list_webauthn_credentials_shortens_id(self):
+        """
+        Test listed credential IDs are cut to their first ten characters.
+        """
+        WebAuthnCredential.objects.create(user=self.user, credential_id="abcdefghijklmnop", public_key=b"key1")
+
+        response = self.client.get(self.list_webauthn_url)
+
+        self.assertEqual(response.json()['credentials'][0]['credential_id_short'], "abcdefghij...")
+
+    def test_list_webauthn_credentials_paginated(self):
+        """
+        Test credentials are returned a page at a time.
+        """
+        for i in range(3):
+            WebAuthnCredential.objects.create(user=self.user, credential_id=f"cred{i}", public_key=b"key")
+
+        response = self.client.get(self.list_webauthn_url, {'page_size': 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['count'], 3)
+        self.assertEqual(len(response.json()['credentials']), 2)
+        self.assertIsNotNone(response.json()['next'])
+
     def test_delete_account_success(self):
         """
         Test successful user account deletion.
@@ -544,7 +783,49 @@ class AuthViewsTest(APITestCase):
         response = self.client.delete(self.delete_account_url)
         
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
-        self.assertEqual(CustomUser.objects.count(), 0)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertIsNotNone(self.user.deleted_at)
+        self.assertFalse(Token.objects.filter(user=self.user).exists())
+        self.assertFalse(WebAuthnCredential.objects.filter(user=self.user).exists())
+
+    def test_purge_deleted_accounts(self):
+        """
+        Test deleted accounts are removed once their retention period has passed.
+        """
+        self.client.delete(self.delete_account_url)
+
+        call_command('purge_deleted_accounts', days=0, stdout=StringIO())
+        self.assertFalse(CustomUser.objects.filter(pk=self.user.pk).exists())
+
+    def test_deleted_account_cannot_be_reactivated_by_otp(self):
+        """
+        Test OTP verification can't reactivate a deleted account, which the purge then removes.
+        """
+        OTP.objects.create(user=self.user, otp='123456')
+        self.client.delete(self.delete_account_url)
+        self.client.credentials()
+
+        response = self.client.post(self.send_otp_url, {"identifier": self.user.email}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.mock_send_email.assert_not_called()
+
+        response = self.client.post(self.verify_otp_url, {"identifier": self.user.email, "otp": "123456"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+
+        call_command('purge_deleted_accounts', days=0, stdout=StringIO())
+        self.assertFalse(CustomUser.objects.filter(pk=self.user.pk).exists())
+
+    def test_purge_skips_active_accounts(self):
+        """
+        Test the purge leaves an active account alone even if it still has deleted_at set.
+        """
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=True, deleted_at=timezone.now() - timedelta(days=31))
+
+        call_command('purge_deleted_accounts', stdout=StringIO())
+        self.assertTrue(CustomUser.objects.filter(pk=self.user.pk).exists())
 
     def test_delete_account_unauthenticated(self):
         """
@@ -554,3 +835,22 @@ class AuthViewsTest(APITestCase):
         response = self.client.delete(self.delete_account_url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
         self.assertIn('Authentication credentials were not provided.', str(response.content))
+
+    # --- Token Helper Tests ---
+
+    def test_get_user_from_token_header(self):
+        """
+        Test the user is resolved from a well-formed Authorization header.
+        """
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(get_user_from_token(request), self.user)
+
+    def test_get_user_from_token_malformed_header(self):
+        """
+        Test malformed headers are rejected without a database lookup.
+        """
+        for header in ('', 'Bearer abc', 'Token short'):
+            request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=header)
+            with self.assertNumQueries(0), self.assertRaises(AuthenticationFailed):
+                get_user_from_token(request)
+
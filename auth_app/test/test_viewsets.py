@@ -202,6 +202,12 @@ class ReferralViewSetTests(APITestCaseBase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['user']['id'], self.user.id)
 
+    def test_retrieve_referral_joins_both_users(self):
+        """Test the user and referer are fetched with the referral itself."""
+        with self.assertNumQueries(1):
+            response = self.client.get(self.referral_detail_url)
+        self.assertEqual(response.data['referer']['email'], self.other_user.email)
+
     def test_retrieve_other_user_referral_denied(self):
         """Test that a user cannot retrieve another user's referral record."""
         other_referral_detail_url = reverse('referral-detail', args=[self.other_referral.id])
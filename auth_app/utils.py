@@ -4,6 +4,7 @@ import random
 import re
 import cloudinary
 from django.core.mail import send_mail
+from django.db import transaction
 import requests
 import hashlib
 import time
@@ -11,6 +12,7 @@ import base64
 import hmac
 from decouple import config
 import string
+import contextvars
 
 from agbado import settings
 from .models import OTP, User
@@ -41,10 +43,12 @@ def generate_otp():
     return str(random.randint(10000, 99999))
 
 
-# Create OTP in the database
+# Create OTP in the database, retiring any the user has not used yet
 def create_otp(user):
     otp = generate_otp()
-    otp_instance = OTP.objects.create(user=user, otp=otp)
+    with transaction.atomic():
+        OTP.objects.filter(user=user, is_used=False).update(is_used=True)
+        otp_instance = OTP.objects.create(user=user, otp=otp)
     return otp_instance
 
 
@@ -55,6 +59,58 @@ def send_otp_email(user, otp):
     send_mail(subject, message, settings.EMAIL_HOST_USER, [user.email])
 
 
+# Held per request context rather than per thread, since under ASGI sync views
+# from concurrent requests share one thread
+_pending_otps = contextvars.ContextVar('pending_otps', default=None)
+
+
+def start_otp_deliveries():
+    """
+    Start holding OTP deliveries for the current request.
+    """
+    _pending_otps.set([])
+
+
+def send_queued_otps():
+    """
+    Send every OTP held for the current request.
+
+    Returns:
+        int: Number of OTPs handed to their sender
+    """
+    pending = _pending_otps.get()
+    _pending_otps.set(None)
+    if not pending:
+        return 0
+
+    for send, user, otp in pending:
+        try:
+            send(user, otp)
+        except Exception as e:
+            logger.error(f"Error sending OTP to user {user.pk}: {str(e)}")
+    return len(pending)
+
+
+def queue_otp(send, user, otp):
+    """
+    Queue an OTP to be sent with the given sender.
+
+    Inside a request the OTP is sent once the response has gone out, so the
+    client doesn't wait on SMTP or the SMS gateway; anywhere else it is sent
+    immediately.
+
+    Args:
+        send: send_otp_email or send_otp_sms
+        user: User receiving the OTP
+        otp (str): The OTP to send
+    """
+    pending = _pending_otps.get()
+    if pending is None:
+        send(user, otp)
+    else:
+        pending.append((send, user, otp))
+
+
 def format_phone_number(phone_number: str) -> str:
     """
     Formats a phone number to E.164 standard (e.g., 2349024563447).
@@ -81,6 +137,20 @@ def format_phone_number(phone_number: str) -> str:
 
     return phone_number
 
+def base64url_encode(data: bytes) -> str:
+    """
+    Encodes bytes as unpadded base64url text, the form WebAuthn uses on the wire.
+    """
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def base64url_decode(value: str) -> bytes:
+    """
+    Decodes unpadded base64url text, adding only the padding the input is missing.
+    """
+    return base64.urlsafe_b64decode(value + '=' * (-len(value) % 4))
+
+
 def send_otp_sms(user, otp):
     """
     Sends an SMS message using the Termii API.
@@ -5,53 +5,44 @@ This module contains views for user registration, login, OTP verification, PIN m
 WebAuthn biometric authentication, and account management operations.
 """
 
-"""
-Authentication app views for handling user registration, login, and authentication.
-
-This module contains views for user registration, login, OTP verification, PIN management,
-WebAuthn biometric authentication, and account management operations.
-"""
-
-from django.shortcuts import redirect
-import jwt
-from rest_framework import status, permissions
-from rest_framework.authentication import TokenAuthentication
+from rest_framework import status
 from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.authtoken.models import Token
-from django.contrib.auth import authenticate, login, logout
-from django.core.exceptions import ValidationError
-from django.utils.decorators import method_decorator
-from django.views.decorators.csrf import csrf_exempt
-
-import base64
-import os
-import hashlib
+from django.contrib.auth import authenticate, logout
+from django.contrib.auth.signals import user_logged_in
+from django.contrib.auth.hashers import check_password, make_password
+
+import re
 from rest_framework.permissions import IsAuthenticated, AllowAny
 
-from django.db import IntegrityError, transaction
-from django.db import DatabaseError
+from django.db import transaction
+from django.db import DatabaseError, IntegrityError
+from django.db.models import F, Q
+from django.db.models.functions import Substr
 from django.utils import timezone
 
 
 from django.conf import settings
+from django.core.cache import cache
 from webauthn import generate_registration_options, verify_registration_response, generate_authentication_options, verify_authentication_response
-from webauthn.helpers.cose import COSEAlgorithmIdentifier
+from webauthn.helpers import parse_authentication_credential_json, parse_registration_credential_json
+from webauthn.helpers.exceptions import WebAuthnException
 from webauthn.helpers.structs import (
-    RegistrationCredential,
-    AuthenticationCredential,
     PublicKeyCredentialDescriptor,
     AuthenticatorSelectionCriteria,
     UserVerificationRequirement
 )
 
-from agbado import settings
-from notification_app.models import Notification
+from notification_app.utils import queue_notification
 from user_app.models import UserReward
-from .serializers import UserSerializer
+from .authentication import CachedTokenAuthentication, get_token_for_user, invalidate_cached_user
+from .serializers import RegistrationResponseSerializer, UserRegistrationSerializer, get_user_data
 from .models import User as CustomUser, OTP, Referral, WebAuthnCredential
-from .utils import create_otp, send_otp_email, send_otp_sms, write_to_file
+from .viewsets import CustomPagination
+from .utils import base64url_decode, base64url_encode, create_otp, queue_otp, send_otp_email, send_otp_sms
 import logging
 
 
@@ -60,6 +51,56 @@ logger = logging.getLogger(__name__)
 # Reward for referring a user (subject to change)
 REFERRAL_REWARD = 50
 
+# Columns loaded when looking a user up by email or phone number
+USER_LOOKUP_FIELDS = (
+    'id', 'email', 'phone_number', 'password', 'is_verified', 'is_active',
+    'pin', 'is_busy', 'first_name', 'last_name',
+)
+
+# How long (in seconds) a WebAuthn challenge stays valid
+WEBAUTHN_CHALLENGE_TIMEOUT = 300
+
+# Minimum time (in seconds) between two OTPs generated for the same user
+OTP_RATE_LIMIT_SECONDS = 60
+
+# Most OTP requests accepted for one identifier from one client IP per window, and the window length (in seconds)
+OTP_REQUESTS_PER_WINDOW = 3
+OTP_REQUEST_WINDOW_SECONDS = 3600
+
+
+def webauthn_registration_challenge_key(user_id):
+    """
+    Builds the cache key holding a user's pending WebAuthn registration challenge.
+
+    :param user_id: The ID of the user registering a credential
+    :return: The cache key
+    """
+    return f"webauthn:reg:{user_id}:challenge"
+
+
+def webauthn_authentication_challenge_key(user_id):
+    """
+    Builds the cache key holding a user's pending WebAuthn authentication challenge.
+
+    :param user_id: The ID of the user logging in
+    :return: The cache key
+    """
+    return f"webauthn:auth:{user_id}:challenge"
+
+
+# A PIN is exactly six ASCII digits
+_PIN_RE = re.compile(r'\A[0-9]{6}\Z')
+
+
+def is_valid_pin(pin):
+    """
+    Checks that a PIN is a string of exactly six ASCII digits.
+
+    :param pin: The PIN submitted by the client
+    :return: True if the PIN is well formed
+    """
+    return isinstance(pin, str) and _PIN_RE.match(pin) is not None
+
 
 def get_user_from_token(request):
     """
@@ -69,33 +110,177 @@ def get_user_from_token(request):
     :return: The user associated with the token
     :raises: AuthenticationFailed if token is invalid or missing
     """
-    try:
-        token = request.headers.get('Authorization', '').split(' ')[1]
-        token = Token.objects.get(key=token)
-        return token.user
+    # TokenAuthentication has already loaded the token together with its user
+    if isinstance(getattr(request, 'auth', None), Token):
+        return request.auth.user
+
+    header = request.headers.get('Authorization', '')
+    if not header.startswith('Token '):
+        raise AuthenticationFailed('Invalid Authorization header format')
+
+    # DRF token keys are always 40 characters, so anything else can't match a row
+    key = header[6:]
+    if len(key) != 40:
+        raise AuthenticationFailed('Invalid token')
 
+    try:
+        return Token.objects.select_related('user').get(key=key).user
     except Token.DoesNotExist:
         raise AuthenticationFailed('Invalid token')
-    except (IndexError, ValueError):
-        raise AuthenticationFailed('Invalid Authorization header format')
 
 
-def delete_token(request):
+def credit_referral_reward(referer_id):
     """
-    Deletes the token from the Authorization header.
+    Credits the referral reward to the referer's reward account.
 
-    :param request: The current request object
-    :raises: AuthenticationFailed if token is invalid or missing
+    Increments the points in a single UPDATE and only creates the
+    reward account when the referer does not have one yet.
+
+    :param referer_id: The id of the user who referred the new user
+    """
+    updated = UserReward.objects.filter(user_id=referer_id).update(points=F('points') + REFERRAL_REWARD)
+    if not updated:
+        UserReward.objects.create(user_id=referer_id, points=REFERRAL_REWARD)
+
+
+def get_referer_id(referral_code):
+    """
+    Looks up the user a referral code belongs to.
+
+    :param referral_code: The optional referral code the user supplied
+    :return: The ID of the referring user, or None if there is no such code
+    """
+    if not referral_code:
+        return None
+    return CustomUser.objects.filter(referral_code=referral_code).values_list('id', flat=True).first()
+
+
+def duplicate_registration_message(error):
+    """
+    Builds the response message for a registration rejected by a unique constraint.
+
+    The violated constraint is named at the end of the first line of the
+    database error on MySQL, PostgreSQL and SQLite alike.
+
+    :param error: The IntegrityError raised while creating the user
+    :return: The message to return to the client
+    """
+    constraint = str(error).splitlines()[0].rsplit(' ', 1)[-1] if str(error) else ''
+    if 'phone_number' in constraint:
+        return "A user with this phone number already exists."
+    if 'email' in constraint:
+        return "A user with this email already exists."
+    return "A user with this email or phone number already exists."
+
+
+def get_user_by_identifier(identifier):
+    """
+    Looks up a user by email address or phone number in a single query.
+
+    Accounts their owners deleted are left out, so OTP and password reset
+    can't bring them back before they are purged.
+
+    :param identifier: The email address or phone number the client sent
+    :return: The matching user, or None if no user matches
+    """
+    return CustomUser.objects.filter(
+        Q(email=identifier) | Q(phone_number=identifier), deleted_at__isnull=True
+    ).only(*USER_LOOKUP_FIELDS).first()
+
+
+def active_otp_cache_key(user_id):
     """
+    Builds the cache key flagging that a user has an unexpired OTP outstanding.
+
+    :param user_id: The ID of the user the OTP was issued to
+    :return: The cache key
+    """
+    return f"otp:active:{user_id}"
+
+
+def otp_rate_limit_cache_key(user_id):
+    """
+    Builds the cache key marking that a user was recently sent an OTP.
+
+    :param user_id: The ID of the user
+    :return: The cache key
+    """
+    return f"otp:rl:{user_id}"
+
+
+def claim_otp_slot(user_id):
+    """
+    Claims the user's OTP slot for the rate limit window.
+
+    Uses cache.add(), so only one of several concurrent requests gets the slot.
+
+    :param user_id: The ID of the user requesting an OTP
+    :return: True if an OTP may be generated now, False if the user must wait
+    """
+    return cache.add(otp_rate_limit_cache_key(user_id), 1, timeout=OTP_RATE_LIMIT_SECONDS)
+
+
+def get_client_ip(request):
+    """
+    Returns the IP address of the client that made the request.
+
+    Prefers the X-Real-IP header set by the hosting proxy, since behind it
+    REMOTE_ADDR is the proxy's own address.
+
+    :param request: The incoming request
+    :return: The client's IP address, or an empty string if unknown
+    """
+    return request.META.get('HTTP_X_REAL_IP') or request.META.get('REMOTE_ADDR', '')
+
+
+def otp_request_count_cache_key(identifier, client_ip):
+    """
+    Builds the cache key counting OTP requests made for an identifier from one client.
+
+    :param identifier: The email address or phone number the client sent
+    :param client_ip: The IP address the requests came from
+    :return: The cache key
+    """
+    return f"otp:rl:id:{identifier.strip().lower()}:{client_ip}"
+
+
+def allow_otp_request(request, identifier):
+    """
+    Counts an OTP request for the identifier against its hourly allowance.
+
+    The allowance is per client IP, so a third party who knows someone's
+    email or phone number can't use it up and lock them out of verification
+    and password reset. SMS and email spend per user is still capped by
+    claim_otp_slot().
+
+    Runs before any database query, so requests over the limit cost a
+    single cache round trip.
+
+    :param request: The incoming request
+    :param identifier: The email address or phone number the client sent
+    :return: True if the request may go ahead, False if the limit is reached
+    """
+    key = otp_request_count_cache_key(identifier, get_client_ip(request))
+    cache.add(key, 0, timeout=OTP_REQUEST_WINDOW_SECONDS)
     try:
-        token = request.headers.get('Authorization', '').split(' ')[1]
-        token = Token.objects.get(key=token)
-        token.delete()
+        count = cache.incr(key)
+    except ValueError:
+        # The window expired between add() and incr()
+        cache.set(key, 1, timeout=OTP_REQUEST_WINDOW_SECONDS)
+        count = 1
+    return count <= OTP_REQUESTS_PER_WINDOW
+
+
+def mark_otp_active(otp_instance):
+    """
+    Flags the OTP's user as having an active OTP until the OTP expires.
+
+    :param otp_instance: The OTP that was issued
+    """
+    timeout = (otp_instance.expires_at - timezone.now()).total_seconds()
+    if timeout > 0:
+        cache.set(active_otp_cache_key(otp_instance.user_id), 1, timeout=timeout)
 
-    except Token.DoesNotExist:
-        raise AuthenticationFailed('Invalid token')
-    except (IndexError, ValueError):
-        raise AuthenticationFailed('Invalid Authorization header format')
 
 class RegisterServiceProviderView(APIView):
     """
@@ -127,58 +312,48 @@ class RegisterServiceProviderView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        try:
-            if CustomUser.objects.filter(email=email).exists():
+        # Email and phone number uniqueness is enforced by the database when the user is inserted
+        referer_id = get_referer_id(referral_code)
+
+        user_data = {
+            'first_name': first_name,
+            'last_name': last_name,
+            'email': email,
+            'phone_number': phone_number,
+            'state': state,
+            'password': password
+        }
+        serializer = UserRegistrationSerializer(data=user_data)
+
+        if serializer.is_valid():
+            try:
+                # Commit the user and everything created with it together
+                with transaction.atomic():
+                    user = serializer.save(is_service_provider=True)
+
+                    # Handle referral if a valid referral_code was provided
+                    if referer_id:
+                        Referral.objects.create(user=user, referer_id=referer_id)
+
+                    # Generate OTP
+                    create_otp(user)
+
+                    # A new user has no token yet, so create it without a lookup
+                    token = Token.objects.create(user=user)
+            except IntegrityError as e:
                 return Response(
-                    {"message": "A user with this email already exists."}, 
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-            if CustomUser.objects.filter(phone_number=phone_number).exists():
-                return Response(
-                    {"message": "A user with this phone number already exists."},
+                    {"message": duplicate_registration_message(e)},
                     status=status.HTTP_400_BAD_REQUEST
                 )
+            
+            logger.info(f"Service provider registered successfully: {user.email}")
+            
+            return Response({
+                "token": token.key,
+                "user": RegistrationResponseSerializer(user).data
+            }, status=status.HTTP_201_CREATED)
 
-            user_data = {
-                'first_name': first_name,
-                'last_name': last_name,
-                'email': email,
-                'phone_number': phone_number,
-                'state': state,
-                'password': password
-            }
-            serializer = UserSerializer(data=user_data)
-
-            if serializer.is_valid():
-                user = serializer.save()
-                user.set_password(password)
-                user.is_service_provider = True
-
-                # Handle referral if referral_code was provided
-                if referral_code and CustomUser.objects.filter(referral_code=referral_code).exists():
-                    referer = CustomUser.objects.get(referral_code=referral_code)
-                    Referral.objects.create(user=user, referer=referer)
-
-                user.save()
-
-                # Generate and send OTP
-                otp_instance = create_otp(user)
-                otp = otp_instance.otp
-
-                token, created = Token.objects.get_or_create(user=user)
-                
-                logger.info(f"Service provider registered successfully: {user.email}")
-                
-                return Response({
-                    "token": token.key,
-                    "user": serializer.data
-                }, status=status.HTTP_201_CREATED)
-
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        except CustomUser.DoesNotExist:
-            return Response({"message": "User with the provided email or phone number does not exist."},
-                            status=status.HTTP_400_BAD_REQUEST)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 class RegisterUserView(APIView):
@@ -211,60 +386,49 @@ class RegisterUserView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        try:
-            if CustomUser.objects.filter(email=email).exists():
+        # Email and phone number uniqueness is enforced by the database when the user is inserted
+        referer_id = get_referer_id(referral_code)
+
+        user_data = {
+            'first_name': first_name,
+            'last_name': last_name,
+            'email': email,
+            'phone_number': phone_number,
+            'state': state,
+            'password': password
+        }
+        serializer = UserRegistrationSerializer(data=user_data)
+
+        if serializer.is_valid():
+            try:
+                # Commit the user and everything created with it together
+                with transaction.atomic():
+                    user = serializer.save()
+
+                    # Handle referral if a valid referral_code was provided
+                    if referer_id:
+                        Referral.objects.create(user=user, referer_id=referer_id)
+                        credit_referral_reward(referer_id)
+
+                    # Generate OTP
+                    create_otp(user)
+
+                    # A new user has no token yet, so create it without a lookup
+                    token = Token.objects.create(user=user)
+            except IntegrityError as e:
                 return Response(
-                    {"message": "A user with this email already exists."}, 
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-            if CustomUser.objects.filter(phone_number=phone_number).exists():
-                return Response(
-                    {"message": "A user with this phone number already exists."},
+                    {"message": duplicate_registration_message(e)},
                     status=status.HTTP_400_BAD_REQUEST
                 )
+            
+            logger.info(f"User registered successfully: {user.email}")
+            
+            return Response({
+                "token": token.key,
+                "user": RegistrationResponseSerializer(user).data
+            }, status=status.HTTP_201_CREATED)
 
-            user_data = {
-                'first_name': first_name,
-                'last_name': last_name,
-                'email': email,
-                'phone_number': phone_number,
-                'state': state,
-                'password': password
-            }
-            serializer = UserSerializer(data=user_data)
-
-            if serializer.is_valid():
-                user = serializer.save()
-                user.set_password(password)
-
-                # Handle referral if referral_code was provided
-                if referral_code and CustomUser.objects.filter(referral_code=referral_code).exists():
-                    referer = CustomUser.objects.get(referral_code=referral_code)
-                    Referral.objects.create(user=user, referer=referer)
-                    user_reward, created = UserReward.objects.get_or_create(user=referer)
-                    user_reward.points += REFERRAL_REWARD
-                    user_reward.save()
-
-                user.save()
-
-                # Generate and send OTP
-                otp_instance = create_otp(user)
-                otp = otp_instance.otp
-
-                token, created = Token.objects.get_or_create(user=user)
-                
-                logger.info(f"User registered successfully: {user.email}")
-                
-                return Response({
-                    "token": token.key,
-                    "user": serializer.data
-                }, status=status.HTTP_201_CREATED)
-
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        except CustomUser.DoesNotExist:
-            return Response({"message": "User with the provided email or phone number does not exist."},
-                            status=status.HTTP_400_BAD_REQUEST)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 class SendOTPView(APIView):
@@ -289,35 +453,35 @@ class SendOTPView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        try:
-            # Check if identifier is email or phone number
-            if '@' in identifier:
-                user = CustomUser.objects.get(email=identifier)
-                # Generate and send OTP
-                otp_instance = create_otp(user)
-                otp = otp_instance.otp
-                # Send OTP to email
-                send_otp_email(user, otp)
-            else:
-                user = CustomUser.objects.get(phone_number=identifier)
-                # Generate and send OTP
-                otp_instance = create_otp(user)
-                otp = otp_instance.otp
-                # Send OTP to phone
-                send_otp_sms(user, otp)
-
-            logger.info(f"OTP sent successfully to {identifier}")
+        if not allow_otp_request(request, identifier):
             return Response(
-                {"message": "OTP successfully sent. You can now log in."}, 
-                status=status.HTTP_200_OK
+                {"message": "Too many OTP requests. Please try again later."},
+                status=status.HTTP_429_TOO_MANY_REQUESTS
             )
 
-        except CustomUser.DoesNotExist:
+        user = get_user_by_identifier(identifier)
+        if user is None:
             return Response({"message": "User with the provided email or phone number does not exist."},
                             status=status.HTTP_400_BAD_REQUEST)
 
+        if not claim_otp_slot(user.id):
+            return Response(
+                {"message": "Please wait before requesting another OTP."},
+                status=status.HTTP_429_TOO_MANY_REQUESTS
+            )
 
-        return Response({"message": "OTP successfully sent. You can now log in."}, status=status.HTTP_200_OK)
+        # Generate the OTP and send it over the channel the identifier came from
+        otp_instance = create_otp(user)
+        if '@' in identifier:
+            queue_otp(send_otp_email, user, otp_instance.otp)
+        else:
+            queue_otp(send_otp_sms, user, otp_instance.otp)
+
+        logger.info(f"OTP sent successfully to {identifier}")
+        return Response(
+            {"message": "OTP successfully sent. You can now log in."}, 
+            status=status.HTTP_200_OK
+        )
 
 
 class VerifyOTPView(APIView):
@@ -344,47 +508,47 @@ class VerifyOTPView(APIView):
             )
 
         try:
-            # Check if identifier is email or phone number
-            if '@' in identifier:
-                user = CustomUser.objects.get(email=identifier)
-            else:
-                user = CustomUser.objects.get(phone_number=identifier)
-
-            # Check OTP validity
-            existing_otp = OTP.objects.filter(user=user, otp=otp, is_used=False).last()
-
-            if not existing_otp:
+            # Find the OTP and its user together; expired OTPs and deleted accounts are filtered out
+            otp_match = OTP.objects.filter(
+                Q(user__email=identifier) | Q(user__phone_number=identifier),
+                otp=otp, is_used=False, expires_at__gt=timezone.now(), user__deleted_at__isnull=True
+            ).order_by('-id').values_list('id', 'user_id').first()
+
+            if otp_match is None:
+                # Only a failed match pays for telling an unknown user from a wrong OTP
+                if not CustomUser.objects.filter(
+                    Q(email=identifier) | Q(phone_number=identifier), deleted_at__isnull=True
+                ).exists():
+                    return Response({"message": "User with the provided email or phone number does not exist."},
+                                    status=status.HTTP_400_BAD_REQUEST)
                 return Response(
                     {"message": "Invalid OTP."}, 
                     status=status.HTTP_400_BAD_REQUEST
                 )
+            otp_id, user_id = otp_match
 
-            if existing_otp.is_expired():
-                return Response(
-                    {"message": "OTP has expired."}, 
-                    status=status.HTTP_400_BAD_REQUEST
-                )
+            # Claim the OTP and verify the user in one commit
+            with transaction.atomic():
+                # Claim the OTP in one UPDATE so concurrent requests can't both use it
+                claimed = OTP.objects.filter(pk=otp_id, is_used=False).update(is_used=True)
+                if not claimed:
+                    return Response(
+                        {"message": "Invalid OTP."},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
 
-            # Mark user as verified
-            user.is_verified = True
-            user.is_active = True
-            user.save()
+                # Mark user as verified
+                CustomUser.objects.filter(pk=user_id, deleted_at__isnull=True).update(is_verified=True, is_active=True)
 
-            # Mark OTP as used
-            existing_otp.is_used = True
-            existing_otp.save()
+            cache.delete(active_otp_cache_key(user_id))
+            invalidate_cached_user(user_id)
 
-            logger.info(f"User account verified successfully: {user.email}")
+            logger.info(f"User account verified successfully: {identifier}")
             return Response(
                 {"message": "Account verified successfully. You can now log in."}, 
                 status=status.HTTP_200_OK
             )
 
-        except CustomUser.DoesNotExist:
-            return Response(
-                {"message": "User with the provided email or phone number does not exist."},
-                status=status.HTTP_400_BAD_REQUEST
-            )
         except Exception as e:
             logger.error(f"Error verifying OTP: {str(e)}")
             return Response(
@@ -399,7 +563,7 @@ class PinRegistrationView(APIView):
     
     Allows users to set a 6-digit PIN for additional security.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -408,10 +572,10 @@ class PinRegistrationView(APIView):
         
         Required fields: pin (6-digit number)
         """
-        user = get_user_from_token(request)
+        user = request.user
         pin = request.data.get("pin")
         
-        if not pin or len(pin) != 6 or not pin.isdigit():
+        if not is_valid_pin(pin):
             return Response(
                 {"message": "PIN must be a 6-digit number."}, 
                 status=status.HTTP_400_BAD_REQUEST
@@ -424,8 +588,8 @@ class PinRegistrationView(APIView):
             )
         
         try:
-            user.pin = pin
-            user.save()
+            CustomUser.objects.filter(pk=user.pk).update(pin=make_password(pin))
+            invalidate_cached_user(user.pk)
             
             logger.info(f"PIN registered successfully for user: {user.email}")
             return Response(
@@ -446,7 +610,7 @@ class PinUpdateView(APIView):
     
     Allows users to change their existing PIN.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def put(self, request):
@@ -455,10 +619,10 @@ class PinUpdateView(APIView):
         
         Required fields: pin (6-digit number)
         """
-        user = get_user_from_token(request)
+        user = request.user
         pin = request.data.get("pin")
 
-        if not pin or len(pin) != 6 or not pin.isdigit():
+        if not is_valid_pin(pin):
             return Response(
                 {"message": "PIN must be a 6-digit number."}, 
                 status=status.HTTP_400_BAD_REQUEST
@@ -471,8 +635,8 @@ class PinUpdateView(APIView):
             )
         
         try:
-            user.pin = pin
-            user.save()
+            CustomUser.objects.filter(pk=user.pk).update(pin=make_password(pin))
+            invalidate_cached_user(user.pk)
             
             logger.info(f"PIN updated successfully for user: {user.email}")
             return Response(
@@ -493,7 +657,7 @@ class PinAuthView(APIView):
     
     Verifies the user's PIN for additional security.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -502,16 +666,16 @@ class PinAuthView(APIView):
         
         Required fields: pin (6-digit number)
         """
-        user = get_user_from_token(request)
+        user = request.user
         pin = request.data.get("pin")
 
-        if not pin or len(pin) != 6 or not pin.isdigit():
+        if not is_valid_pin(pin):
             return Response(
                 {"message": "PIN must be a 6-digit number."}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        if user.pin != pin:
+        if not check_password(pin, user.pin):
             return Response(
                 {"message": "Invalid PIN. Try again"}, 
                 status=status.HTTP_400_BAD_REQUEST
@@ -546,20 +710,8 @@ class LoginView(APIView):
             )
 
         try:
-            # Attempt authentication using email
-            user = None
-            if '@' in identifier:
-                # If identifier contains '@', treat it as email
-                user = authenticate(request, email=identifier, password=password)
-            else:
-                # Else, treat it as phone number
-                try:
-                    user = CustomUser.objects.get(phone_number=identifier)
-                    if not user.check_password(password):
-                        user = None
-                except CustomUser.DoesNotExist:
-                    user = None
-
+            # The backend resolves the identifier as either an email or a phone number
+            user = authenticate(request, identifier=identifier, password=password)
         except Exception as e:
             logger.error(f"Error during login: {str(e)}")
             return Response(
@@ -568,11 +720,12 @@ class LoginView(APIView):
             )
 
         if user is not None:
-            login(request, user)
+            # Clients authenticate with the token, so no session is created
+            user_logged_in.send(sender=user.__class__, request=request, user=user)
             # Create and return token if credentials are valid
-            token, created = Token.objects.get_or_create(user=user)
+            token_key = get_token_for_user(user)
             return Response({
-                "token": token.key,
+                "token": token_key,
                 "has_pin": bool(user.pin),
                 "user": {
                     "email": user.email,
@@ -590,24 +743,22 @@ class LogoutView(APIView):
     
     Removes the user's authentication token and logs them out.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
     def post(self, request):
         """
         Logout user and delete their token.
         """
-        try:
-            user = get_user_from_token(request)
-            delete_token(request)
-            logout(request)
-            
-            logger.info(f"User logged out successfully: {user.email}")
-            return Response(
-                {"message": "Logged out successfully."}, 
-                status=status.HTTP_200_OK
-            )
-        except AuthenticationFailed as e:
-            return Response({'detail': str(e)}, status=status.HTTP_401_UNAUTHORIZED)
+        user = request.user
+        # The authentication class has already loaded the token the request was made with
+        request.auth.delete()
+        logout(request)
+
+        logger.info(f"User logged out successfully: {user.email}")
+        return Response(
+            {"message": "Logged out successfully."}, 
+            status=status.HTTP_200_OK
+        )
 
 
 class ForgotPasswordView(APIView):
@@ -632,30 +783,50 @@ class ForgotPasswordView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        if not allow_otp_request(request, identifier):
+            return Response(
+                {"message": "Too many OTP requests. Please try again later."},
+                status=status.HTTP_429_TOO_MANY_REQUESTS
+            )
+
         try:
-            # Check if identifier is email or phone number
-            if '@' in identifier:
-                user = CustomUser.objects.get(email=identifier)
-            else:
-                user = CustomUser.objects.get(phone_number=identifier)
+            user = get_user_by_identifier(identifier)
+            if user is None:
+                return Response({"message": "User with the provided email or phone number does not exist."},
+                                status=status.HTTP_400_BAD_REQUEST)
 
             # Check if there's an existing OTP and it's still valid
-            existing_otp = OTP.objects.filter(user=user, is_used=False).last()
-            if existing_otp and not existing_otp.is_expired():
+            otp_already_sent = cache.get(active_otp_cache_key(user.id))
+            if not otp_already_sent:
+                existing_otp = OTP.objects.filter(
+                    user_id=user.id, is_used=False, expires_at__gt=timezone.now()
+                ).only('user_id', 'expires_at').first()
+                if existing_otp:
+                    mark_otp_active(existing_otp)
+                    otp_already_sent = True
+
+            if otp_already_sent:
                 return Response(
                     {"message": "An OTP was already sent. Please check your email/phone."},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
+            if not claim_otp_slot(user.id):
+                return Response(
+                    {"message": "Please wait before requesting another OTP."},
+                    status=status.HTTP_429_TOO_MANY_REQUESTS
+                )
+
             # Generate and save OTP
             otp_instance = create_otp(user)
             otp = otp_instance.otp
+            mark_otp_active(otp_instance)
 
             # Send OTP to email and phone
             if '@' in identifier:
-                send_otp_email(user, otp)
+                queue_otp(send_otp_email, user, otp)
             else:
-                send_otp_sms(user, otp)
+                queue_otp(send_otp_sms, user, otp)
 
         except Exception as e:
             logger.error(f"Error sending OTP to {identifier}: {str(e)}")
@@ -692,17 +863,16 @@ class ResetPasswordView(APIView):
             )
 
         try:
-            # Check if identifier is email or phone number
-            if '@' in identifier:
-                user = CustomUser.objects.get(email=identifier)
-            else:
-                user = CustomUser.objects.get(phone_number=identifier)
+            user = get_user_by_identifier(identifier)
+            if user is None:
+                return Response({"message": "User with the provided email or phone number does not exist."},
+                                status=status.HTTP_400_BAD_REQUEST)
 
             # Update password
             user.set_password(new_password)
-            user.save()
+            user.save(update_fields=['password'])
 
-            Notification.objects.create(
+            queue_notification(
                 user=user, 
                 title="Password Reset Successful", 
                 message="Your password has been successfully reset."
@@ -723,23 +893,24 @@ class UpdateIsBusyView(APIView):
     
     Toggles the is_busy field for the authenticated user.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def put(self, request):
         """
         Update user's busy status.
         """
-        user = get_user_from_token(request)
+        user = request.user
 
         try:
-            # Toggle the is_busy field
-            user.is_busy = not user.is_busy
-            user.save()
+            # Toggle the is_busy field in the database so concurrent toggles can't be lost
+            CustomUser.objects.filter(pk=user.pk).update(is_busy=~F('is_busy'))
+            invalidate_cached_user(user.pk)
+            is_busy = CustomUser.objects.filter(pk=user.pk).values_list('is_busy', flat=True).first()
 
-            logger.info(f"User busy status updated: {user.email} - {user.is_busy}")
+            logger.info(f"User busy status updated: {user.email} - {is_busy}")
             return Response({
-                'is_busy': user.is_busy,
+                'is_busy': is_busy,
                 'message': 'Successfully updated user status.'
             }, status=status.HTTP_200_OK)
 
@@ -754,8 +925,10 @@ class GoogleAppleAuthView(APIView):
     """
     Handle Google/Apple authentication.
     
-    Processes social authentication and either logs in existing users
-    or redirects to registration for new users.
+    Social sign-in is disabled until the provider's ID token is verified
+    against its JWKS, with the audience, issuer and expiry checked and the
+    email taken from the verified claims. Signing users in by a posted email
+    alone would let anyone take over an account.
     """
     permission_classes = [AllowAny]
 
@@ -763,52 +936,13 @@ class GoogleAppleAuthView(APIView):
         """
         Handle Google/Apple authentication.
         
-        Required fields: email, first_name, last_name
-        Optional fields: phone_number, state, password, referral_code
+        Always responds with 501 Not Implemented; no token is issued.
         """
-        data = request.data
-
-        email = data.get("email")
-        first_name = data.get("first_name")
-        last_name = data.get("last_name")
-        phone_number = data.get("phone_number")
-        password = data.get("password")
-        state = data.get('state')
-        referral_code = data.get('referral_code')
-
-        if not email:
-            return Response(
-                {"message": "Email is required for social authentication."},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        try:
-            # Check if user already exists
-            user = CustomUser.objects.get(email=email)
-            # If user exists, login and return data
-            login(request, user)
-
-            Notification.objects.create(
-                user=user, 
-                title="Login Successful", 
-                message="You have successfully logged in via Google/Apple."
-            )
-            
-            logger.info(f"Social login successful for user: {user.email}")
-            return Response({
-                "message": "Login successful",
-                "user": {
-                    "email": user.email,
-                    "first_name": user.first_name,
-                    "last_name": user.last_name,
-                    "phone_number": getattr(user, 'phone_number', None)
-                }
-            }, status=status.HTTP_200_OK)
-
-        except CustomUser.DoesNotExist:
-            # If user doesn't exist, register them
-            logger.info(f"New user attempting social registration: {email}")
-            return redirect('register-user')
+        logger.warning("Rejected social login: ID token verification is not implemented")
+        return Response(
+            {"message": "Google/Apple sign-in is not available yet."},
+            status=status.HTTP_501_NOT_IMPLEMENTED
+        )
 
 
 # --- WebAuthn (FIDO2) Biometric Authentication Views ---
@@ -820,31 +954,28 @@ class StartWebAuthnRegistrationView(APIView):
     
     Generates registration options for biometric authentication setup.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
         """
         Start WebAuthn registration process.
         """
-        user = get_user_from_token(request)
-        if not user:
-            return Response(
-                {"message": "Authentication failed: User not found."}, 
-                status=status.HTTP_401_UNAUTHORIZED
-            )
+        user = request.user
 
         # Generate unique user_id for WebAuthn (can be user.id or a UUID)
         webauthn_user_id = str(user.id).encode('utf-8')
 
         # Get existing credential IDs for exclusion
-        existing_credentials = WebAuthnCredential.objects.filter(user=user)
+        existing_credentials = WebAuthnCredential.objects.filter(user=user).values_list(
+            'credential_id', 'transports'
+        ).order_by()
         exclude_credentials = [
             PublicKeyCredentialDescriptor(
-                id=base64.urlsafe_b64decode(cred.credential_id + '==='),
+                id=base64url_decode(credential_id),
                 type='public-key',
-                transports=[t.strip() for t in cred.transports.split(',')] if cred.transports else None
-            ) for cred in existing_credentials
+                transports=[t.strip() for t in transports.split(',')] if transports else None
+            ) for credential_id, transports in existing_credentials
         ]
 
         try:
@@ -860,9 +991,8 @@ class StartWebAuthnRegistrationView(APIView):
                 ),
                 attestation='direct'
             )
-            # Store the challenge in session or a temporary DB record
-            request.session['challenge'] = base64.urlsafe_b64encode(options.challenge).decode('utf-8').rstrip("=")
-            request.session['user_id_for_webauthn_reg'] = str(user.id)
+            # Store the challenge in the cache until the client completes registration
+            cache.set(webauthn_registration_challenge_key(user.id), options.challenge, timeout=WEBAUTHN_CHALLENGE_TIMEOUT)
 
             logger.info(f"WebAuthn registration started for user: {user.email}")
             return Response({
@@ -880,58 +1010,48 @@ class CompleteWebAuthnRegistrationView(APIView):
     
     Verifies the registration response and saves the credential.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
         """
         Complete WebAuthn registration process.
         """
-        user = get_user_from_token(request)
-        if not user:
-            return Response(
-                {"message": "Authentication failed: User not found."}, 
-                status=status.HTTP_401_UNAUTHORIZED
-            )
+        user = request.user
 
-        # Retrieve the challenge and user ID from session/temporary storage
-        stored_challenge = request.session.pop('challenge', None)
-        stored_user_id_for_webauthn_reg = request.session.pop('user_id_for_webauthn_reg', None)
+        # Retrieve and consume the challenge stored for this user
+        challenge_key = webauthn_registration_challenge_key(user.id)
+        stored_challenge = cache.get(challenge_key)
 
-        if not stored_challenge or stored_user_id_for_webauthn_reg != str(user.id):
+        if not stored_challenge or not cache.delete(challenge_key):
             return Response(
                 {"message": "Invalid or expired registration challenge."}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
 
         try:
-            # Decode the base64url challenge
-            decoded_challenge = base64.urlsafe_b64decode(stored_challenge + '===')
-
-            # Parse the client's response
-            registration_response = RegistrationCredential.parse_raw(request.body)
+            # Parse the client's response from the body DRF has already decoded
+            registration_response = parse_registration_credential_json(request.data)
 
             # Verify the registration response
             verification = verify_registration_response(
                 credential=registration_response,
-                expected_challenge=decoded_challenge,
-                expected_origin=request.headers.get('Origin') or f"{request.scheme}://{request.get_host()}",
+                expected_challenge=stored_challenge,
+                expected_origin=settings.WEBAUTHN_ORIGINS,
                 expected_rp_id=settings.WEBAUTHN_RP_ID,
                 require_user_verification=False
             )
 
             # Save the new credential
-            credential_id_b64 = base64.urlsafe_b64encode(verification.credential_id).decode('utf-8').rstrip("=")
-            public_key_b64 = base64.urlsafe_b64encode(verification.credential_public_key).decode('utf-8').rstrip("=")
+            credential_id_b64 = base64url_encode(verification.credential_id)
 
-            with transaction.atomic():
-                WebAuthnCredential.objects.create(
-                    user=user,
-                    credential_id=credential_id_b64,
-                    public_key=public_key_b64,
-                    sign_count=verification.sign_count,
-                    transports=','.join(registration_response.response.transports) if registration_response.response.transports else None
-                )
+            WebAuthnCredential.objects.create(
+                user=user,
+                credential_id=credential_id_b64,
+                public_key=verification.credential_public_key,
+                sign_count=verification.sign_count,
+                transports=','.join(registration_response.response.transports) if registration_response.response.transports else None
+            )
 
             logger.info(f"WebAuthn credential registered successfully for user: {user.email}")
             return Response(
@@ -939,7 +1059,7 @@ class CompleteWebAuthnRegistrationView(APIView):
                 status=status.HTTP_201_CREATED
             )
 
-        except ValueError as e:
+        except (ValueError, WebAuthnException) as e:
             logger.warning(f"WebAuthn registration verification failed for user {user.email}: {e}")
             return Response(
                 {"message": f"WebAuthn verification failed: {str(e)}"}, 
@@ -981,28 +1101,34 @@ class StartWebAuthnAuthenticationView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        try:
-            user = CustomUser.objects.get(email=email)
-        except CustomUser.DoesNotExist:
-            return Response(
-                {"message": "User not found."}, 
-                status=status.HTTP_404_NOT_FOUND
+        # Get all registered credentials for this user, joined with the user, in a single query.
+        # Deactivated and deleted accounts are treated as unknown.
+        user_credentials = list(
+            WebAuthnCredential.objects.filter(
+                user__email=email, user__is_active=True, user__deleted_at__isnull=True
             )
-
-        # Get all registered credentials for this user
-        user_credentials = WebAuthnCredential.objects.filter(user=user)
-        if not user_credentials.exists():
+            .values_list('credential_id', 'transports', 'user_id')
+            .order_by()
+        )
+        if not user_credentials:
+            if not CustomUser.objects.filter(email=email, is_active=True, deleted_at__isnull=True).exists():
+                return Response(
+                    {"message": "User not found."}, 
+                    status=status.HTTP_404_NOT_FOUND
+                )
             return Response(
                 {"message": "No WebAuthn credentials registered for this user. Please use password login or register biometrics first."}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        user_id = user_credentials[0][2]
+
         allow_credentials = [
             PublicKeyCredentialDescriptor(
-                id=base64.urlsafe_b64decode(cred.credential_id + '==='),
+                id=base64url_decode(credential_id),
                 type='public-key',
-                transports=[t.strip() for t in cred.transports.split(',')] if cred.transports else None
-            ) for cred in user_credentials
+                transports=[t.strip() for t in transports.split(',')] if transports else None
+            ) for credential_id, transports, _ in user_credentials
         ]
 
         try:
@@ -1011,17 +1137,16 @@ class StartWebAuthnAuthenticationView(APIView):
                 allow_credentials=allow_credentials,
                 user_verification=UserVerificationRequirement.PREFERRED
             )
-            # Store the challenge in session or a temporary DB record
-            request.session['challenge'] = base64.urlsafe_b64encode(options.challenge).decode('utf-8').rstrip("=")
-            request.session['user_id_for_webauthn_auth'] = str(user.id)
+            # Store the challenge in the cache until the client completes authentication
+            cache.set(webauthn_authentication_challenge_key(user_id), options.challenge, timeout=WEBAUTHN_CHALLENGE_TIMEOUT)
 
-            logger.info(f"WebAuthn authentication started for user: {user.email}")
+            logger.info(f"WebAuthn authentication started for user: {email}")
             return Response({
                 "publicKeyCredentialRequestOptions": options.json
             }, status=status.HTTP_200_OK)
 
         except Exception as e:
-            logger.error(f"Error starting WebAuthn authentication for user {user.email}: {e}")
+            logger.error(f"Error starting WebAuthn authentication for user {email}: {e}")
             return Response(
                 {"message": f"Failed to start WebAuthn authentication: {str(e)}"}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -1037,74 +1162,79 @@ class CompleteWebAuthnAuthenticationView(APIView):
     """
     authentication_classes = []
     permission_classes = [AllowAny]
+    renderer_classes = [JSONRenderer]
 
     def post(self, request):
         """
         Complete WebAuthn authentication process.
         """
-        # Retrieve the challenge and user ID from session/temporary storage
-        stored_challenge = request.session.pop('challenge', None)
-        stored_user_id_for_webauthn_auth = request.session.pop('user_id_for_webauthn_auth', None)
-
-        if not stored_challenge or not stored_user_id_for_webauthn_auth:
-            return Response(
-                {"message": "Invalid or expired authentication challenge."}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
         try:
-            user = CustomUser.objects.get(id=int(stored_user_id_for_webauthn_auth))
-        except CustomUser.DoesNotExist:
+            # Parse the client's response from the body DRF has already decoded
+            auth_response = parse_authentication_credential_json(request.data)
+
+            # The credential the client signed with identifies the user logging in.
+            # Its id already arrives base64url encoded, the form credential IDs are stored in.
+            # Credentials of deactivated or deleted accounts read as unknown.
+            stored_credential = WebAuthnCredential.objects.select_related('user').get(
+                credential_id=auth_response.id, user__is_active=True, user__deleted_at__isnull=True
+            )
+        except WebAuthnCredential.DoesNotExist:
             return Response(
-                {"message": "User not found for authentication."}, 
+                {"message": "WebAuthn credential not found for this user."}, 
                 status=status.HTTP_404_NOT_FOUND
             )
+        except DatabaseError:
+            return Response(
+                {"message": "A database error occurred during authentication."}, 
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        except Exception as e:
+            logger.warning(f"Invalid WebAuthn authentication response: {e}")
+            return Response(
+                {"message": f"Invalid WebAuthn authentication response: {str(e)}"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        try:
-            # Decode the base64url challenge
-            decoded_challenge = base64.urlsafe_b64decode(stored_challenge + '===')
+        user = stored_credential.user
 
-            # Parse the client's response
-            auth_response = AuthenticationCredential.parse_raw(request.body)
+        # Retrieve and consume the challenge stored for this user
+        challenge_key = webauthn_authentication_challenge_key(user.id)
+        stored_challenge = cache.get(challenge_key)
 
-            # Retrieve the credential from your DB using the credential ID sent by client
-            credential_id_b64 = base64.urlsafe_b64encode(auth_response.id).decode('utf-8').rstrip("=")
-            stored_credential = WebAuthnCredential.objects.get(
-                user=user,
-                credential_id=credential_id_b64
+        if not stored_challenge or not cache.delete(challenge_key):
+            return Response(
+                {"message": "Invalid or expired authentication challenge."}, 
+                status=status.HTTP_400_BAD_REQUEST
             )
 
+        try:
             verification = verify_authentication_response(
                 credential=auth_response,
-                expected_challenge=decoded_challenge,
-                expected_origin=request.headers.get('Origin') or f"{request.scheme}://{request.get_host()}",
+                expected_challenge=stored_challenge,
+                expected_origin=settings.WEBAUTHN_ORIGINS,
                 expected_rp_id=settings.WEBAUTHN_RP_ID,
-                credential_public_key=base64.urlsafe_b64decode(stored_credential.public_key + '==='),
-                credential_sign_count=stored_credential.sign_count,
+                credential_public_key=bytes(stored_credential.public_key),
+                credential_current_sign_count=stored_credential.sign_count,
                 require_user_verification=False
             )
 
             # Update sign count to prevent replay attacks
-            stored_credential.sign_count = verification.new_sign_count
-            stored_credential.last_used = timezone.now()
-            stored_credential.save()
+            WebAuthnCredential.objects.filter(pk=stored_credential.pk).update(
+                sign_count=verification.new_sign_count,
+                last_used=timezone.now()
+            )
 
-            # Successful authentication, generate/retrieve user token
-            token, created = Token.objects.get_or_create(user=user)
+            # Successful authentication, return the user's token
+            token_key = get_token_for_user(user)
 
             logger.info(f"WebAuthn authentication successful for user: {user.email}")
             return Response({
                 "message": "WebAuthn login successful.",
-                "token": token.key,
-                "user": UserSerializer(user).data
+                "token": token_key,
+                "user": get_user_data(user)
             }, status=status.HTTP_200_OK)
 
-        except WebAuthnCredential.DoesNotExist:
-            return Response(
-                {"message": "WebAuthn credential not found for this user."}, 
-                status=status.HTTP_404_NOT_FOUND
-            )
-        except ValueError as e:
+        except (ValueError, WebAuthnException) as e:
             logger.warning(f"WebAuthn authentication verification failed for user {user.email}: {e}")
             return Response(
                 {"message": f"WebAuthn authentication failed: {str(e)}"}, 
@@ -1126,7 +1256,7 @@ class DeleteWebAuthnCredentialView(APIView):
     
     Allows users to remove their biometric authentication credentials.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def delete(self, request, pk):
@@ -1135,27 +1265,22 @@ class DeleteWebAuthnCredentialView(APIView):
         
         URL parameter: pk (credential ID)
         """
-        user = get_user_from_token(request)
-        if not user:
-            return Response(
-                {"message": "Authentication failed: User not found."}, 
-                status=status.HTTP_401_UNAUTHORIZED
-            )
+        user = request.user
 
         try:
-            credential = WebAuthnCredential.objects.get(pk=pk, user=user)
-            credential.delete()
+            # Delete in a single statement scoped to the user's own credentials
+            deleted, _ = WebAuthnCredential.objects.filter(pk=pk, user=user).delete()
+            if not deleted:
+                return Response(
+                    {"message": "Credential not found or does not belong to this user."}, 
+                    status=status.HTTP_404_NOT_FOUND
+                )
             
             logger.info(f"WebAuthn credential deleted for user: {user.email}")
             return Response(
                 {"message": "WebAuthn credential deleted successfully."}, 
                 status=status.HTTP_204_NO_CONTENT
             )
-        except WebAuthnCredential.DoesNotExist:
-            return Response(
-                {"message": "Credential not found or does not belong to this user."}, 
-                status=status.HTTP_404_NOT_FOUND
-            )
         except DatabaseError:
             return Response(
                 {"message": "A database error occurred while deleting the credential."}, 
@@ -1171,32 +1296,39 @@ class ListWebAuthnCredentialsView(APIView):
     
     Returns all biometric authentication credentials for the user.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         """
         List user's WebAuthn credentials.
         """
-        user = get_user_from_token(request)
-        if not user:
-            return Response(
-                {"message": "Authentication failed: User not found."}, 
-                status=status.HTTP_401_UNAUTHORIZED
-            )
-
-        credentials = WebAuthnCredential.objects.filter(user=user).order_by('-registered_at')
+        user = request.user
+
+        # Only the first characters of the credential ID are shown, so truncate it in SQL
+        credentials = WebAuthnCredential.objects.filter(user=user).order_by('-registered_at').annotate(
+            credential_id_prefix=Substr('credential_id', 1, 10)
+        ).values_list(
+            'id', 'credential_id_prefix', 'registered_at', 'last_used', 'transports', 'sign_count'
+        )
+        paginator = CustomPagination()
+        page = paginator.paginate_queryset(credentials, request, view=self)
         data = [
             {
-                "id": cred.id,
-                "credential_id_short": cred.credential_id[:10] + "...", # Shorten for display
-                "registered_at": cred.registered_at.isoformat(),
-                "last_used": cred.last_used.isoformat() if cred.last_used else None,
-                "transports": cred.transports,
-                "sign_count": cred.sign_count
-            } for cred in credentials
+                "id": pk,
+                "credential_id_short": credential_id_prefix + "...", # Shorten for display
+                "registered_at": registered_at.isoformat(),
+                "last_used": last_used.isoformat() if last_used else None,
+                "transports": transports,
+                "sign_count": sign_count
+            } for pk, credential_id_prefix, registered_at, last_used, transports, sign_count in page
         ]
-        return Response({"credentials": data}, status=status.HTTP_200_OK)
+        return Response({
+            "count": paginator.page.paginator.count,
+            "next": paginator.get_next_link(),
+            "previous": paginator.get_previous_link(),
+            "credentials": data
+        }, status=status.HTTP_200_OK)
 
 # New view for deleting a user account
 
@@ -1204,25 +1336,30 @@ class DeleteAccountView(APIView):
     """
     Delete user account.
     
-    Permanently deletes the authenticated user's account and all associated data.
+    Deactivates the authenticated user's account and revokes their token and
+    WebAuthn credentials. The account and its data are removed later by the
+    purge_deleted_accounts command.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def delete(self, request):
         """
         Delete user account.
         """
-        user = get_user_from_token(request)
+        user = request.user
 
         try:
             user_email = user.email
-            user.delete()
+            # Soft delete with a single UPDATE; the cascade runs when the account is purged
+            CustomUser.objects.filter(pk=user.pk).update(is_active=False, deleted_at=timezone.now())
+            invalidate_cached_user(user.pk)
 
             logger.info(f"User account {user_email} deleted successfully.")
 
-            # After deleting the user, ensure their token is also gone
-            logout(request)
+            # After deleting the user, ensure their token and biometric credentials are also gone
+            Token.objects.filter(user=user).delete()
+            WebAuthnCredential.objects.filter(user=user).delete()
 
             return Response(
                 {"message": "Account deleted successfully."}, 
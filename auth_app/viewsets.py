@@ -48,18 +48,18 @@ class UserViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         """Log user creation."""
         user = serializer.save()
-        logger.info(f"User created: {user.email}")
+        logger.info("User created: %s", user.email)
 
     def perform_update(self, serializer):
         """Log user updates."""
         user = serializer.save()
-        logger.info(f"User updated: {user.email}")
+        logger.info("User updated: %s", user.email)
 
     def perform_destroy(self, instance):
         """Log user deletion."""
         email = instance.email
         instance.delete()
-        logger.info(f"User deleted: {email}")
+        logger.info("User deleted: %s", email)
 
 
 class KYCViewSet(viewsets.ModelViewSet):
@@ -78,17 +78,17 @@ class KYCViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Return KYC records for the authenticated user only."""
-        return KYC.objects.filter(user=self.request.user)
+        return KYC.objects.filter(user=self.request.user).select_related('user')
 
     def perform_create(self, serializer):
         """Log KYC creation."""
         kyc = serializer.save()
-        logger.info(f"KYC created for user: {kyc.user.email}")
+        logger.info("KYC created for user: %s", kyc.user.email)
 
     def perform_update(self, serializer):
         """Log KYC updates."""
         kyc = serializer.save()
-        logger.info(f"KYC updated for user: {kyc.user.email}")
+        logger.info("KYC updated for user: %s", kyc.user.email)
 
 
 class OTPViewSet(viewsets.ModelViewSet):
@@ -107,17 +107,17 @@ class OTPViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Return OTP records for the authenticated user only."""
-        return OTP.objects.filter(user=self.request.user)
+        return OTP.objects.filter(user=self.request.user).select_related('user')
 
     def perform_create(self, serializer):
         """Log OTP creation."""
         otp = serializer.save()
-        logger.info(f"OTP created for user: {otp.user.email}")
+        logger.info("OTP created for user: %s", otp.user.email)
 
     def perform_update(self, serializer):
         """Log OTP updates."""
         otp = serializer.save()
-        logger.info(f"OTP updated for user: {otp.user.email}")
+        logger.info("OTP updated for user: %s", otp.user.email)
 
 
 class ReferralViewSet(viewsets.ModelViewSet):
@@ -134,15 +134,15 @@ class ReferralViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        """Return referrals for the authenticated user only."""
-        return Referral.objects.filter(user=self.request.user)
+        """Return referrals for the authenticated user only, with both users joined."""
+        return Referral.objects.filter(user=self.request.user).select_related('user', 'referer')
 
     def perform_create(self, serializer):
         """Log referral creation."""
         referral = serializer.save()
-        logger.info(f"Referral created: {referral.user.email} referred by {referral.referer.email}")
+        logger.info("Referral created: %s referred by %s", referral.user.email, referral.referer.email)
 
     def perform_update(self, serializer):
         """Log referral updates."""
         referral = serializer.save()
-        logger.info(f"Referral updated: {referral.user.email}")
+        logger.info("Referral updated: %s", referral.user.email)
@@ -6,11 +6,17 @@ including user notifications, message handling, and bulk operations.
 """
 
 from django.contrib import admin, messages
-from django.utils.html import format_html
+from django.db import transaction
+from django.utils.safestring import mark_safe
 from django.db.models import Count
+from django.db.models.functions import Substr
 
 from auth_app.models import User
-from .models import Notification
+from .models import Notification, invalidate_unread_counts
+
+# Read status badges, built once since they never change
+READ_HTML = mark_safe('<span style="color: green;">✓ Read</span>')
+UNREAD_HTML = mark_safe('<span style="color: red;">✗ Unread</span>')
 
 
 @admin.register(Notification)
@@ -30,6 +36,11 @@ class NotificationAdmin(admin.ModelAdmin):
     ordering = ('-created_at',)
     readonly_fields = ('created_at',)
     list_per_page = 25
+    # Skip the extra unfiltered COUNT(*) when a filter or search is applied
+    show_full_result_count = False
+
+    # Characters of the message shown in the changelist
+    MESSAGE_PREVIEW_LENGTH = 50
     
     fieldsets = (
         ('Notification Information', {
@@ -53,15 +64,16 @@ class NotificationAdmin(admin.ModelAdmin):
 
     def get_message_preview(self, obj):
         """Display message preview (first 50 characters)."""
-        preview = obj.message[:50] + "..." if len(obj.message) > 50 else obj.message
+        # One character past the limit is enough to tell whether it was cut
+        preview = obj.message_preview
+        if len(preview) > self.MESSAGE_PREVIEW_LENGTH:
+            return preview[:self.MESSAGE_PREVIEW_LENGTH] + "..."
         return preview
     get_message_preview.short_description = 'Message Preview'
 
     def is_read_display(self, obj):
         """Display read status with color coding."""
-        if obj.is_read:
-            return format_html('<span style="color: green;">✓ Read</span>')
-        return format_html('<span style="color: red;">✗ Unread</span>')
+        return READ_HTML if obj.is_read else UNREAD_HTML
     is_read_display.short_description = 'Status'
     is_read_display.admin_order_field = 'is_read'
 
@@ -73,7 +85,9 @@ class NotificationAdmin(admin.ModelAdmin):
 
     def mark_as_read(self, request, queryset):
         """Mark selected notifications as read."""
+        user_ids = list(queryset.values_list('user_id', flat=True).distinct())
         updated = queryset.update(is_read=True)
+        invalidate_unread_counts(user_ids)
         self.message_user(
             request, 
             f"Successfully marked {updated} notification(s) as read.",
@@ -83,7 +97,9 @@ class NotificationAdmin(admin.ModelAdmin):
 
     def mark_as_unread(self, request, queryset):
         """Mark selected notifications as unread."""
+        user_ids = list(queryset.values_list('user_id', flat=True).distinct())
         updated = queryset.update(is_read=False)
+        invalidate_unread_counts(user_ids)
         self.message_user(
             request, 
             f"Successfully marked {updated} notification(s) as unread.",
@@ -102,37 +118,58 @@ class NotificationAdmin(admin.ModelAdmin):
             return
         
         notification = queryset.first()
-        users = User.objects.filter(is_active=True)
+        user_ids = User.objects.filter(is_active=True).values_list('id', flat=True)
         
-        # Create notifications in batches to avoid memory issues
+        # Stream user IDs and create notifications in batches to avoid memory issues
         batch_size = 1000
         notifications = []
+        sent = 0
         
-        for user in users:
-            notifications.append(Notification(
-                user=user, 
-                title=notification.title, 
-                message=notification.message
-            ))
+        with transaction.atomic():
+            for user_id in user_ids.iterator(chunk_size=batch_size):
+                notifications.append(Notification(
+                    user_id=user_id, 
+                    title=notification.title, 
+                    message=notification.message
+                ))
+                
+                if len(notifications) >= batch_size:
+                    Notification.objects.bulk_create(notifications)
+                    invalidate_unread_counts(n.user_id for n in notifications)
+                    sent += len(notifications)
+                    notifications = []
             
-            if len(notifications) >= batch_size:
+            # Create remaining notifications
+            if notifications:
                 Notification.objects.bulk_create(notifications)
-                notifications = []
-        
-        # Create remaining notifications
-        if notifications:
-            Notification.objects.bulk_create(notifications)
+                invalidate_unread_counts(n.user_id for n in notifications)
+                sent += len(notifications)
 
         self.message_user(
             request, 
-            f"Notification sent to {users.count()} users!", 
+            f"Notification sent to {sent} users!", 
             level=messages.SUCCESS
         )
     send_notification_to_all.short_description = "Send selected notification to all users"
 
     def get_queryset(self, request):
-        """Optimize queryset with select_related."""
-        return super().get_queryset(request).select_related('user')
+        """
+        Optimize queryset with select_related.
+
+        Only the displayed columns are loaded, and the message preview is cut
+        in the database so full message bodies never leave it.
+        """
+        return super().get_queryset(request).select_related('user').only(
+            'id', 'user_id', 'title', 'is_read', 'created_at', 'user__email'
+        ).annotate(
+            message_preview=Substr('message', 1, self.MESSAGE_PREVIEW_LENGTH + 1)
+        )
+
+    def delete_queryset(self, request, queryset):
+        """Delete the selected notifications and drop their users' unread counts."""
+        user_ids = list(queryset.values_list('user_id', flat=True).distinct())
+        super().delete_queryset(request, queryset)
+        invalidate_unread_counts(user_ids)
 
     def get_readonly_fields(self, request, obj=None):
         """Make created_at readonly for all users."""
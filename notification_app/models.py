@@ -5,9 +5,38 @@ This module contains models for managing notifications sent to users.
 """
 
 from datetime import datetime
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
 from auth_app.models import User
 
+# How long a user's unread notification count is cached (seconds)
+UNREAD_COUNT_CACHE_TIMEOUT = 3600
+
+
+def unread_count_cache_key(user_id):
+    """
+    Builds the cache key for a user's unread notification count.
+
+    :param user_id: The ID of the user
+    :return: The cache key
+    """
+    return f"notif:unread:{user_id}"
+
+
+def invalidate_unread_counts(user_ids):
+    """
+    Drops the cached unread counts of the given users.
+
+    Must be called after any write that bypasses Notification.save() or
+    Notification.delete(), such as queryset update(), delete() or bulk_create().
+    Inside a transaction the counts are dropped once it commits, so a count
+    read before the commit isn't cached over the new one.
+
+    :param user_ids: IDs of the users whose notifications changed
+    """
+    keys = [unread_count_cache_key(user_id) for user_id in set(user_ids)]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
 
 class Notification(models.Model):
     """
@@ -47,6 +76,8 @@ class Notification(models.Model):
         indexes = [
             models.Index(fields=['user', '-created_at']),
             models.Index(fields=['is_read', '-created_at']),
+            # Serves the per-user unread count from the index alone
+            models.Index(fields=['user', 'is_read']),
         ]
 
     def __str__(self) -> str:
@@ -54,28 +85,48 @@ class Notification(models.Model):
         title = self.title or "No Title"
         return f"Notification for {self.user.email} - {title}"
 
+    def save(self, *args, **kwargs):
+        """Save the notification and drop the user's cached unread count."""
+        super().save(*args, **kwargs)
+        invalidate_unread_counts([self.user_id])
+
+    def delete(self, *args, **kwargs):
+        """Delete the notification and drop the user's cached unread count."""
+        user_id = self.user_id
+        result = super().delete(*args, **kwargs)
+        invalidate_unread_counts([user_id])
+        return result
+
     def mark_as_read(self):
         """
         Mark the notification as read.
         
-        Updates the is_read field to True.
+        Updates the is_read field to True with a single UPDATE that matches
+        no rows if the notification was already read.
         """
-        self.is_read = True
-        self.save(update_fields=['is_read'])
+        self._set_read(True)
 
     def mark_as_unread(self):
         """
         Mark the notification as unread.
         
-        Updates the is_read field to False.
+        Updates the is_read field to False with a single UPDATE that matches
+        no rows if the notification was already unread.
         """
-        self.is_read = False
-        self.save(update_fields=['is_read'])
+        self._set_read(False)
+
+    def _set_read(self, is_read):
+        updated = type(self).objects.filter(pk=self.pk, is_read=not is_read).update(is_read=is_read)
+        self.is_read = is_read
+        if updated:
+            invalidate_unread_counts([self.user_id])
 
     @classmethod
     def get_unread_count(cls, user):
         """
         Get count of unread notifications for a user.
+
+        The count is cached until one of the user's notifications changes.
         
         Args:
             user: User instance
@@ -83,7 +134,12 @@ class Notification(models.Model):
         Returns:
             int: Count of unread notifications
         """
-        return cls.objects.filter(user=user, is_read=False).count()
+        key = unread_count_cache_key(user.pk)
+        count = cache.get(key)
+        if count is None:
+            count = cls.objects.filter(user=user, is_read=False).count()
+            cache.set(key, count, UNREAD_COUNT_CACHE_TIMEOUT)
+        return count
 
     @classmethod
     def mark_all_as_read(cls, user):
@@ -96,4 +152,6 @@ class Notification(models.Model):
         Returns:
             int: Number of notifications marked as read
         """
-        return cls.objects.filter(user=user, is_read=False).update(is_read=True)
+        updated = cls.objects.filter(user=user, is_read=False).update(is_read=True)
+        invalidate_unread_counts([user.pk])
+        return updated
@@ -37,13 +37,14 @@ class NotificationSerializer(serializers.ModelSerializer):
         
         Ensures message is not empty and has reasonable length.
         """
-        if not value or not value.strip():
+        value = value.strip() if value else ''
+        if not value:
             raise serializers.ValidationError("Message cannot be empty.")
         
         if len(value) > 1000:
             raise serializers.ValidationError("Message is too long. Maximum 1000 characters.")
         
-        return value.strip()
+        return value
 
     def validate_title(self, value):
         """
@@ -51,10 +52,11 @@ class NotificationSerializer(serializers.ModelSerializer):
         
         Ensures title has reasonable length if provided.
         """
+        value = value.strip() if value else value
         if value and len(value) > 200:
             raise serializers.ValidationError("Title is too long. Maximum 200 characters.")
         
-        return value.strip() if value else value
+        return value
 
     def create(self, validated_data):
         """
@@ -64,11 +66,11 @@ class NotificationSerializer(serializers.ModelSerializer):
         """
         try:
             notification = super().create(validated_data)
-            logger.info(f"Notification created for user: {notification.user.email}")
+            logger.info("Notification created for user: %s", notification.user.email)
             return notification
             
         except Exception as e:
-            logger.error(f"Error creating notification: {str(e)}")
+            logger.exception("Error creating notification")
             raise serializers.ValidationError(f"Error creating notification: {str(e)}")
 
     def update(self, instance, validated_data):
@@ -79,11 +81,11 @@ class NotificationSerializer(serializers.ModelSerializer):
         """
         try:
             notification = super().update(instance, validated_data)
-            logger.info(f"Notification updated for user: {notification.user.email}")
+            logger.info("Notification updated for user: %s", notification.user.email)
             return notification
             
         except Exception as e:
-            logger.error(f"Error updating notification: {str(e)}")
+            logger.exception("Error updating notification")
             raise serializers.ValidationError(f"Error updating notification: {str(e)}")
 
 
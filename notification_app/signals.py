@@ -0,0 +1,14 @@
+from django.core.signals import request_finished, request_started
+from django.dispatch import receiver
+
+from notification_app.utils import flush_notification_batch, start_notification_batch
+
+
+@receiver(request_started)
+def begin_notification_batch(sender, **kwargs):
+    start_notification_batch()
+
+
+@receiver(request_finished)
+def write_notification_batch(sender, **kwargs):
+    flush_notification_batch()
@@ -5,18 +5,25 @@ This module contains comprehensive tests for notification-related functionality
 including notification creation, management, and user interactions.
 """
 
+import contextvars
+from unittest.mock import MagicMock
+
 from django.test import TestCase
+from django.contrib.admin.sites import AdminSite
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from django.utils import timezone
 
-from .models import Notification
+from .admin import NotificationAdmin
+from .models import Notification, unread_count_cache_key
 from .serializers import (
     NotificationSerializer, NotificationListSerializer, NotificationDetailSerializer
 )
+from .utils import queue_notification, start_notification_batch, flush_notification_batch
 
 User = get_user_model()
 
@@ -26,6 +33,7 @@ class NotificationModelTest(TestCase):
 
     def setUp(self):
         """Set up test data."""
+        cache.clear()
         self.user = User.objects.create_user(
             email="test@example.com",
             password="testpass123",
@@ -73,6 +81,13 @@ class NotificationModelTest(TestCase):
         self.notification.refresh_from_db()
         self.assertFalse(self.notification.is_read)
 
+    def test_mark_as_read_is_a_single_update(self):
+        """Test marking a notification read issues a single UPDATE."""
+        with self.assertNumQueries(1):
+            self.notification.mark_as_read()
+        self.assertTrue(self.notification.is_read)
+        self.assertTrue(Notification.objects.get(pk=self.notification.pk).is_read)
+
     def test_get_unread_count(self):
         """Test getting unread notification count."""
         # Create another unread notification
@@ -85,6 +100,39 @@ class NotificationModelTest(TestCase):
         unread_count = Notification.get_unread_count(self.user)
         self.assertEqual(unread_count, 2)
 
+    def test_get_unread_count_is_cached(self):
+        """Test a repeated unread count is served without a query."""
+        Notification.get_unread_count(self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(Notification.get_unread_count(self.user), 1)
+
+    def test_get_unread_count_follows_writes(self):
+        """Test the cached unread count is dropped when notifications change."""
+        self.assertEqual(Notification.get_unread_count(self.user), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            queue_notification(self.user, "Queued", "Queued message.")
+        self.assertEqual(Notification.get_unread_count(self.user), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.notification.mark_as_read()
+        self.assertEqual(Notification.get_unread_count(self.user), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Notification.objects.get(title="Queued").delete()
+        self.assertEqual(Notification.get_unread_count(self.user), 0)
+
+    def test_unread_count_dropped_after_commit(self):
+        """Test the cached unread count stays until the writing transaction commits."""
+        self.assertEqual(Notification.get_unread_count(self.user), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Notification.objects.create(user=self.user, title="New", message="New message.")
+            self.assertEqual(cache.get(unread_count_cache_key(self.user.pk)), 1)
+
+        self.assertIsNone(cache.get(unread_count_cache_key(self.user.pk)))
+        self.assertEqual(Notification.get_unread_count(self.user), 2)
+
     def test_mark_all_as_read(self):
         """Test marking all notifications as read."""
         # Create another notification
@@ -113,6 +161,52 @@ class NotificationModelTest(TestCase):
         self.assertEqual(notifications[0], notification2)  # Newer first
 
 
+class NotificationUtilsTest(TestCase):
+    """Test cases for notification queueing helpers."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            password="testpass123",
+            phone_number="1234567890",
+            state="Test State"
+        )
+
+    def test_queue_notification_outside_request_saves_immediately(self):
+        """Test that notifications queued outside a request are saved right away."""
+        notification = queue_notification(self.user, "Title", "Message")
+        self.assertIsNotNone(notification.pk)
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 1)
+
+    def test_queue_notification_in_batch_defers_until_flush(self):
+        """Test that batched notifications are written together on flush."""
+        start_notification_batch()
+        queue_notification(self.user, "First", "First message")
+        queue_notification(self.user, "Second", "Second message")
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 0)
+
+        self.assertEqual(flush_notification_batch(), 2)
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 2)
+
+    def test_batch_is_separate_per_request_context(self):
+        """Test that another request on the same thread neither drops nor flushes this batch."""
+        start_notification_batch()
+        queue_notification(self.user, "Title", "Message")
+
+        other_request = contextvars.Context()
+        other_request.run(start_notification_batch)
+        self.assertEqual(other_request.run(flush_notification_batch), 0)
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 0)
+
+        self.assertEqual(flush_notification_batch(), 1)
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 1)
+
+    def test_flush_without_batch_is_noop(self):
+        """Test that flushing with nothing buffered writes nothing."""
+        self.assertEqual(flush_notification_batch(), 0)
+
+
 class NotificationSerializerTest(TestCase):
     """Test cases for NotificationSerializer."""
 
@@ -162,6 +256,12 @@ class NotificationSerializerTest(TestCase):
         with self.assertRaises(Exception):
             serializer.validate_message(long_message)
 
+    def test_validate_message_checks_stripped_length(self):
+        """Test the length limit applies to the message as it will be saved."""
+        serializer = NotificationSerializer()
+        message = "x" * 1000
+        self.assertEqual(serializer.validate_message(f"  {message}  "), message)
+
     def test_validate_title_too_long(self):
         """Test title validation with too long title."""
         serializer = NotificationSerializer()
@@ -242,6 +342,64 @@ class NotificationDetailSerializerTest(TestCase):
         self.assertEqual(data['user_name'], "Test User")
 
 
+class NotificationAdminTest(TestCase):
+    """Test cases for NotificationAdmin."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            password="testpass123",
+            phone_number="1234567890",
+            state="Test State"
+        )
+        self.admin = NotificationAdmin(Notification, AdminSite())
+        Notification.objects.create(user=self.user, title="Long", message="x" * 500)
+        Notification.objects.create(user=self.user, title="Short", message="Short message")
+
+    def test_changelist_row_renders_from_one_query(self):
+        """Test the displayed columns need no queries beyond the changelist's own."""
+        with self.assertNumQueries(1):
+            rows = {
+                notification.title: (
+                    self.admin.get_message_preview(notification),
+                    self.admin.get_user_email(notification),
+                )
+                for notification in self.admin.get_queryset(None)
+            }
+        self.assertEqual(rows["Long"], ("x" * 50 + "...", self.user.email))
+        self.assertEqual(rows["Short"], ("Short message", self.user.email))
+
+    def test_is_read_display(self):
+        """Test the read status badge matches the notification's state."""
+        notification = Notification.objects.get(title="Short")
+        self.assertIn("Unread", self.admin.is_read_display(notification))
+        notification.is_read = True
+        self.assertIn("✓ Read", self.admin.is_read_display(notification))
+
+    def test_send_notification_to_all_active_users(self):
+        """Test the action copies the notification to every active user."""
+        User.objects.create_user(
+            email="other@example.com",
+            password="testpass123",
+            phone_number="0987654321",
+            state="Test State"
+        )
+        User.objects.create_user(
+            email="inactive@example.com",
+            password="testpass123",
+            phone_number="1122334455",
+            state="Test State",
+            is_active=False
+        )
+        self.admin.message_user = MagicMock()
+
+        self.admin.send_notification_to_all(None, Notification.objects.filter(title="Short"))
+
+        self.assertEqual(Notification.objects.filter(title="Short").count(), 3)
+        self.assertIn("2 users", self.admin.message_user.call_args[0][1])
+
+
 class NotificationAppViewsTest(APITestCase):
     """Test cases for notification app views."""
 
@@ -0,0 +1,73 @@
+"""
+Utility helpers for the notification app.
+
+Notifications raised while handling a request are buffered and written with a
+single bulk insert once the response has been sent, so views don't pay for the
+INSERT on the response path.
+
+The buffer is held in a context variable rather than a thread-local: under ASGI,
+sync views from concurrent requests share one thread but each request runs in
+its own context.
+"""
+
+import contextvars
+
+from .models import Notification, invalidate_unread_counts
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+_pending_notifications = contextvars.ContextVar('pending_notifications', default=None)
+
+
+def start_notification_batch():
+    """
+    Start buffering notifications for the current request.
+    """
+    _pending_notifications.set([])
+
+
+def flush_notification_batch():
+    """
+    Write all notifications buffered for the current request in one bulk insert.
+
+    Returns:
+        int: Number of notifications written
+    """
+    pending = _pending_notifications.get()
+    _pending_notifications.set(None)
+    if not pending:
+        return 0
+
+    try:
+        Notification.objects.bulk_create(pending)
+    except Exception as e:
+        logger.error(f"Error writing {len(pending)} queued notification(s): {str(e)}")
+        return 0
+    invalidate_unread_counts(notification.user_id for notification in pending)
+    return len(pending)
+
+
+def queue_notification(user, title, message):
+    """
+    Queue a notification for a user.
+
+    Inside a request the notification is buffered until the response has been
+    sent; anywhere else (management commands, shell) it is saved immediately.
+
+    Args:
+        user: User receiving the notification
+        title: Title of the notification
+        message: Content of the notification
+
+    Returns:
+        Notification: The queued notification instance
+    """
+    notification = Notification(user=user, title=title, message=message)
+    pending = _pending_notifications.get()
+    if pending is None:
+        notification.save()
+    else:
+        pending.append(notification)
+    return notification
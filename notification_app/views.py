@@ -9,11 +9,10 @@ from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
-from auth_app.views import get_user_from_token
-from .models import Notification
+from auth_app.authentication import CachedTokenAuthentication
+from .models import Notification, invalidate_unread_counts
 from django.db import DatabaseError
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
@@ -30,7 +29,7 @@ class GetUserNotificationsView(APIView):
     
     Retrieves all notifications for the user and marks them as read.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
@@ -41,13 +40,14 @@ class GetUserNotificationsView(APIView):
         and marks them as read.
         """
         try:
-            user = get_user_from_token(request)
+            user = request.user
 
             # Retrieve all notifications for the authenticated user, ordered by time
             notifications = Notification.objects.filter(user=user).order_by('-created_at')
 
             # Mark all notifications as read
             notifications.update(is_read=True)
+            invalidate_unread_counts([user.id])
 
             # Serialize the data to return the notifications
             notification_data = [
@@ -87,7 +87,7 @@ class UpdateAllNotificationsReadStatusView(APIView):
     
     Updates the read status of all unread notifications for the user.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def patch(self, request):
@@ -95,7 +95,7 @@ class UpdateAllNotificationsReadStatusView(APIView):
         Mark all notifications as read for the authenticated user.
         """
         try:
-            user = get_user_from_token(request)
+            user = request.user
 
             # Get all unread notifications for the user
             notifications = Notification.objects.filter(user=user, is_read=False)
@@ -107,6 +107,7 @@ class UpdateAllNotificationsReadStatusView(APIView):
 
             # Mark all notifications as read
             updated_count = notifications.update(is_read=True)
+            invalidate_unread_counts([user.id])
 
             logger.info(f"Marked {updated_count} notifications as read for user: {user.email}")
             return Response({
@@ -134,7 +135,7 @@ class DeleteSingleNotificationView(APIView):
     
     Allows users to delete a specific notification by ID.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def delete(self, request, pk):
@@ -144,13 +145,7 @@ class DeleteSingleNotificationView(APIView):
         URL parameter: pk (notification ID)
         """
         try:
-            user = get_user_from_token(request)
-
-            if not user:
-                return Response(
-                    {"message": "Authentication failed: User not found."}, 
-                    status=status.HTTP_401_UNAUTHORIZED
-                )
+            user = request.user
 
             # Get the notification, ensuring it belongs to the authenticated user
             notification = get_object_or_404(Notification, pk=pk, user=user)
@@ -188,7 +183,7 @@ class DeleteMultipleNotificationsView(APIView):
     
     Allows users to delete multiple notifications by providing a list of IDs.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -198,13 +193,7 @@ class DeleteMultipleNotificationsView(APIView):
         Required fields: notification_ids (list of notification IDs)
         """
         try:
-            user = get_user_from_token(request)
-
-            if not user:
-                return Response(
-                    {"message": "Authentication failed: User not found."}, 
-                    status=status.HTTP_401_UNAUTHORIZED
-                )
+            user = request.user
 
             notification_ids = request.data.get('notification_ids', [])
             if not isinstance(notification_ids, list):
@@ -221,6 +210,7 @@ class DeleteMultipleNotificationsView(APIView):
 
             # Delete notifications that belong to the user and are in the provided list of IDs
             deleted_count, _ = Notification.objects.filter(user=user, id__in=notification_ids).delete()
+            invalidate_unread_counts([user.id])
 
             if deleted_count == 0:
                 return Response(
@@ -253,7 +243,7 @@ class DeleteAllNotificationsView(APIView):
     
     Removes all notifications belonging to the user.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def delete(self, request):
@@ -261,16 +251,11 @@ class DeleteAllNotificationsView(APIView):
         Delete all notifications for the authenticated user.
         """
         try:
-            user = get_user_from_token(request)
-
-            if not user:
-                return Response(
-                    {"message": "Authentication failed: User not found."}, 
-                    status=status.HTTP_401_UNAUTHORIZED
-                )
+            user = request.user
 
             # Delete all notifications for the authenticated user
             deleted_count, _ = Notification.objects.filter(user=user).delete()
+            invalidate_unread_counts([user.id])
             
             logger.info(f"Deleted {deleted_count} notifications for user: {user.email}")
             return Response({
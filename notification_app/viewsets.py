@@ -51,15 +51,15 @@ class NotificationViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         """Log notification creation."""
         notification = serializer.save()
-        logger.info(f"Notification created for user: {notification.user.email}")
+        logger.info("Notification created for user: %s", notification.user.email)
 
     def perform_update(self, serializer):
         """Log notification updates."""
         notification = serializer.save()
-        logger.info(f"Notification updated for user: {notification.user.email}")
+        logger.info("Notification updated for user: %s", notification.user.email)
 
     def perform_destroy(self, instance):
         """Log notification deletion."""
         user_email = instance.user.email
         instance.delete()
-        logger.info(f"Notification deleted for user: {user_email}")
+        logger.info("Notification deleted for user: %s", user_email)
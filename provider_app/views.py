@@ -10,13 +10,12 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 
 from rest_framework import status
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
 from auth_app.utils import upload_to_cloudinary
-from auth_app.views import get_user_from_token
+from auth_app.authentication import CachedTokenAuthentication
 from notification_app.models import Notification
 from provider_app.models import ServiceProvider
 
@@ -34,7 +33,7 @@ class CreateServiceProviderView(APIView):
     
     Allows users to create their service provider profile with company details.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -46,7 +45,7 @@ class CreateServiceProviderView(APIView):
                         company_logo, opening_hour, closing_hour
         """
         try:
-            user = get_user_from_token(request)
+            user = request.user
 
             if hasattr(user, "provider_profile"):
                 return Response(
@@ -136,7 +135,7 @@ class EditServiceProviderView(APIView):
     
     Allows users to update their service provider profile details.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -148,7 +147,7 @@ class EditServiceProviderView(APIView):
                         company_logo, opening_hour, closing_hour
         """
         try:
-            user = get_user_from_token(request)
+            user = request.user
 
             try:
                 service_provider = user.provider_profile
@@ -243,7 +242,7 @@ class GetServiceProviderDetailsView(APIView):
     
     Retrieves the service provider profile for the authenticated user.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
@@ -251,7 +250,7 @@ class GetServiceProviderDetailsView(APIView):
         Get service provider profile details.
         """
         try:
-            user = get_user_from_token(request)
+            user = request.user
 
             # Get the service provider profile
             try:
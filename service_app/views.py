@@ -10,7 +10,6 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 
 from rest_framework import status
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -18,7 +17,7 @@ from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 
 from auth_app.utils import upload_to_cloudinary
-from auth_app.views import get_user_from_token
+from auth_app.authentication import CachedTokenAuthentication
 from notification_app.models import Notification
 from provider_app.models import ServiceProvider
 from provider_app.serializers import ServiceProviderSerializer
@@ -37,7 +36,7 @@ class GetAllServicesDetailsView(APIView):
     Retrieves comprehensive information about the service provider's services,
     reviews, and provider details.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
@@ -45,7 +44,7 @@ class GetAllServicesDetailsView(APIView):
         Get all services and details for a service provider.
         """
         try:
-            user = get_user_from_token(request)
+            user = request.user
             service_provider = ServiceProvider.objects.get(user=user)
 
             provider_data = {
@@ -113,7 +112,7 @@ class GetServiceDetailsView(APIView):
     
     Retrieves service information and its associated subservices.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, service_id):
@@ -169,7 +168,7 @@ class GetSubServiceDetailsView(APIView):
     
     Retrieves subservice information.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, sub_service_id):
@@ -209,7 +208,7 @@ class AddServiceView(APIView):
     
     Allows service providers to create new services.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -220,7 +219,7 @@ class AddServiceView(APIView):
         Optional fields: is_active, image
         """
         try:
-            user = get_user_from_token(request)
+            user = request.user
             service_provider = ServiceProvider.objects.get(user=user)
 
             name = request.data.get('name')
@@ -291,7 +290,7 @@ class AddSubServiceView(APIView):
     
     Allows service providers to create new subservices for existing services.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request, service_id):
@@ -303,7 +302,7 @@ class AddSubServiceView(APIView):
         Optional fields: is_active, image
         """
         try:
-            user = get_user_from_token(request)
+            user = request.user
             service = get_object_or_404(Service, id=service_id)
 
             name = request.data.get('name')
@@ -359,7 +358,7 @@ class EditServiceView(APIView):
     
     Allows service providers to update their services.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request, service_id):
@@ -370,7 +369,7 @@ class EditServiceView(APIView):
         Optional fields: name, description, category, min_price, max_price, is_active, image
         """
         try:
-            user = get_user_from_token(request)
+            user = request.user
             service = get_object_or_404(Service, id=service_id)
 
             if 'image' in request.FILES:
@@ -410,7 +409,7 @@ class EditSubServiceView(APIView):
     
     Allows service providers to update their subservices.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request, subservice_id):
@@ -421,7 +420,7 @@ class EditSubServiceView(APIView):
         Optional fields: name, description, price, is_active, image
         """
         try:
-            user = get_user_from_token(request)
+            user = request.user
             subservice = get_object_or_404(SubService, id=subservice_id)
 
             if 'image' in request.FILES:
@@ -459,12 +458,12 @@ class ServiceProviderBookingsView(APIView):
     """
     Get all bookings for a service provider.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
         try:
-            user = get_user_from_token(request)
+            user = request.user
             provider = ServiceProvider.objects.get(user=user)
             bookings = Booking.objects.filter(provider=provider)
             serializer = BookingSerializer(bookings, many=True)
@@ -484,12 +483,12 @@ class ServiceProviderBidsView(APIView):
     """
     Get service requests in provider's category and their bids.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
         try:
-            user = get_user_from_token(request)
+            user = request.user
 
             try:
                 provider = ServiceProvider.objects.get(user=user)
@@ -538,12 +537,12 @@ class SubmitBidView(APIView):
     """
     Submit or update a bid for a service request.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request, service_request_id, *args, **kwargs):
         try:
-            user = get_user_from_token(request)
+            user = request.user
             provider = ServiceProvider.objects.get(user=user)
 
             try:
@@ -612,12 +611,12 @@ class WithdrawBidView(APIView):
     """
     Withdraw a bid -> Withdraw a bid made for a request.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request, bid_id, *args, **kwargs):
         try:
-            user = get_user_from_token(request)
+            user = request.user
             provider = ServiceProvider.objects.get(user=user)
 
             try:
@@ -653,12 +652,12 @@ class InProgressBookingView(APIView):
     """
     Set a booking in progress by the provider.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request, booking_id, *args, **kwargs):
         try:
-            user = get_user_from_token(request)
+            user = request.user
             provider = ServiceProvider.objects.get(user=user)
 
             try:
@@ -687,12 +686,12 @@ class CancelBookingView(APIView):
     """
     Cancel a booking by the provider.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request, booking_id, *args, **kwargs):
         try:
-            user = get_user_from_token(request)
+            user = request.user
             provider = ServiceProvider.objects.get(user=user)
 
             try:
@@ -721,12 +720,12 @@ class CompleteBookingView(APIView):
     """
     Mark a booking as completed by the provider.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request, booking_id, *args, **kwargs):
         try:
-            user = get_user_from_token(request)
+            user = request.user
             provider = ServiceProvider.objects.get(user=user)
 
             try:
@@ -755,12 +754,12 @@ class ConfirmBookingView(APIView):
     """
     Mark a booking as confirmed by the user.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request, booking_id, *args, **kwargs):
         try:
-            user = get_user_from_token(request)
+            user = request.user
 
             try:
                 booking = Booking.objects.get(id=int(booking_id), user=user)
@@ -788,12 +787,12 @@ class UserBookingsView(APIView):
     """
     Get all bookings for a user (client).
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
         try:
-            user = get_user_from_token(request)
+            user = request.user
             bookings = Booking.objects.filter(user=user)
             serializer = BookingSerializer(bookings, many=True)
 
@@ -812,12 +811,12 @@ class AcceptBidView(APIView):
     """
     Accept a bid -> Creates a booking & rejects all other bids for the same request.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request, bid_id, *args, **kwargs):
         try:
-            user = get_user_from_token(request)
+            user = request.user
 
             try:
                 bid = ServiceRequestBid.objects.get(id=bid_id, service_request__user=user)
@@ -881,12 +880,12 @@ class DeclineBidView(APIView):
     """
     Decline a specific bid without accepting any other.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request, bid_id, *args, **kwargs):
         try:
-            user = get_user_from_token(request)
+            user = request.user
 
             try:
                 bid = ServiceRequestBid.objects.get(id=bid_id, service_request__user=user)
@@ -922,7 +921,7 @@ class CreateServiceRequestView(APIView):
     
     Allows user to create new service request.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -933,7 +932,7 @@ class CreateServiceRequestView(APIView):
         Optional fields: longitude, latitude, address
         """
         try:
-            user = get_user_from_token(request)
+            user = request.user
 
             title = request.data.get('title')
             description = request.data.get('description')
@@ -1003,7 +1002,7 @@ class EditServiceRequestView(APIView):
     
     Allows user to create new service request.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request, service_request_id, *args, **kwargs):
@@ -1014,7 +1013,7 @@ class EditServiceRequestView(APIView):
         Optional fields: longitude, latitude, address
         """
         try:
-            user = get_user_from_token(request)
+            user = request.user
 
             title = request.data.get('title')
             description = request.data.get('description')
@@ -1088,7 +1087,7 @@ class GetUserServiceRequestsView(APIView):
     
     Retrieves comprehensive information about the user's service requests.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
@@ -1096,7 +1095,7 @@ class GetUserServiceRequestsView(APIView):
         Get all service requests made by a user.
         """
         try:
-            user = get_user_from_token(request)
+            user = request.user
 
             service_requests = ServiceRequest.objects.filter(user=user)
             service_request_data = [{
@@ -1132,7 +1131,7 @@ class GetServiceRequestBidsView(APIView):
     
     Retrieves comprehensive information about the service request's bids.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, service_request_id, *args, **kwargs):
@@ -1140,7 +1139,7 @@ class GetServiceRequestBidsView(APIView):
         Get all bids for a service request.
         """
         try:
-            user = get_user_from_token(request)
+            user = request.user
 
             service_request = ServiceRequest.objects.get(id=service_request_id)
             bids = ServiceRequestBid.objects.filter(service_request=service_request)
@@ -1177,7 +1176,7 @@ class GetServiceRequestDetailsView(APIView):
     
     Retrieves service request information.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, service_request_id):
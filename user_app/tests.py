@@ -7,11 +7,14 @@ including tasks, rewards, activities, and gifts.
 
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 
+from auth_app.authentication import auth_user_cache_key
+
 from .models import (
     DailyTask, TaskCompletion, UserReward, UserActivity, 
     LeisureAccess, Gift, UserGift
@@ -277,6 +280,21 @@ class UserAppViewsTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('referral_code', response.data)
 
+    def test_change_password_with_cached_user(self):
+        """Test changing the password works for a user served from the token cache without its hash."""
+        cache.clear()
+        self.client.get(reverse('get_referral_code'))
+        self.assertNotIn('password', cache.get(auth_user_cache_key(self.user.pk)).__dict__)
+
+        response = self.client.post(
+            reverse('change_password'),
+            {'current_password': 'testpass123', 'new_password': 'newpass456'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('newpass456'))
+
     def test_get_referral_code_unauthenticated(self):
         """Test getting referral code without authentication."""
         self.client.credentials()  # Remove authentication
@@ -12,13 +12,12 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.authentication import TokenAuthentication
 
 from auth_app.models import KYC
 from auth_app.serializers import KYCSerializer
 from decouple import config
 from auth_app.utils import upload_to_cloudinary
-from auth_app.views import get_user_from_token
+from auth_app.authentication import CachedTokenAuthentication
 from notification_app.models import Notification
 from provider_app.models import ServiceProvider
 from wallet_app.models import Wallet, Transaction
@@ -37,13 +36,13 @@ class DashboardView(APIView):
     Returns user details, wallet information, recent transactions,
     and notification status.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         try:
             # Fetch user details
-            user = get_user_from_token(request)
+            user = request.user
             user_data = {
                 "id": user.id,
                 "email": user.email,
@@ -81,7 +80,7 @@ class DashboardView(APIView):
 
         try:
             # Check if the user has any unread notifications
-            has_unread_notifications = Notification.objects.filter(user=user, is_read=False).exists()
+            has_unread_notifications = Notification.get_unread_count(user) > 0
         except Exception as e:
             has_unread_notifications = False
 
@@ -122,12 +121,12 @@ class GetKYCDetailsView(APIView):
     Returns the user's KYC information including verification status
     and document details.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         # Fetch user details
-        user = get_user_from_token(request)
+        user = request.user
 
         try:
 
@@ -157,11 +156,11 @@ class UpdateUserProfileView(APIView):
     Allows users to update their phone number, state, and profile picture.
     Creates a notification when profile is successfully updated.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        user = get_user_from_token(request)
+        user = request.user
 
         # Extract data from the request
         phone_number = request.data.get('phone_number')
@@ -217,11 +216,11 @@ class UpdateKYCView(APIView):
     Handles KYC document uploads and updates verification status.
     Supports partial updates of KYC information.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated] # Uncomment and set this up as needed
 
     def post(self, request):
-        user = get_user_from_token(request)
+        user = request.user
 
         # 1. Get or create the KYC instance correctly.
         # get_or_create returns a tuple: (object, created_boolean).
@@ -287,7 +286,7 @@ class ChangePasswordView(APIView):
     Allows authenticated users to change their password.
     Validates old password before allowing the change.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -295,7 +294,7 @@ class ChangePasswordView(APIView):
         Change the user's password after validating the current password.
         User provides current_password and new_password.
         """
-        user = get_user_from_token(request)
+        user = request.user
 
         current_password = request.data.get('current_password')
         new_password = request.data.get('new_password')
@@ -328,10 +327,10 @@ class GetReferralCode(APIView):
     
     Returns the unique referral code for the authenticated user.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user = get_user_from_token(request)
+        user = request.user
         referral_code = user.referral_code
         return Response({"referral_code": referral_code}, status=status.HTTP_200_OK)
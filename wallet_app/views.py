@@ -16,12 +16,11 @@ from django.db import transaction as db_transaction
 from django.db.models import Q
 
 from rest_framework import status
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from auth_app.views import get_user_from_token
+from auth_app.authentication import CachedTokenAuthentication
 from notification_app.models import Notification
 from wallet_app.models import Wallet, Transaction, Withdrawal, Bank
 from wallet_app.serializers import (
@@ -32,12 +31,11 @@ from wallet_app.serializers import (
 from auth_app.models import User # Ensure User model is correctly imported
 
 from rest_framework import status
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from auth_app.views import get_user_from_token
+from auth_app.authentication import CachedTokenAuthentication
 from notification_app.models import Notification
 from wallet_app.services import (
     create_dedicated_account_for_user,
@@ -88,11 +86,11 @@ def _verify_monnify_signature(request_body: bytes, signature_header: str) -> boo
 
 
 class WalletDetailsView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user = get_user_from_token(request)
+        user = request.user
         wallet, _ = Wallet.objects.get_or_create(user=user)
         data = WalletSerializer(wallet).data
         # Optionally enrich with Monnify account details
@@ -100,11 +98,11 @@ class WalletDetailsView(APIView):
 
 
 class AllTransactionsView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user = get_user_from_token(request)
+        user = request.user
         txs = Transaction.objects.filter(user=user).order_by("-created_at")
         return Response(
             {"transactions": TransactionSerializer(txs, many=True).data},
@@ -113,12 +111,12 @@ class AllTransactionsView(APIView):
 
 
 class TransactionDetailView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated] # Enable permission
 
     def get(self, request, pk): # Use 'pk' (primary key) for detail view conventions
         try:
-            user = get_user_from_token(request)
+            user = request.user
 
             # Fetch the specific transaction for the user
             # Use get_object_or_404 for cleaner error handling
@@ -137,11 +135,11 @@ class TransactionDetailView(APIView):
 
 
 class WithdrawalRequestView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        user = get_user_from_token(request)
+        user = request.user
         serializer = WithdrawalRequestSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 